@@ -3,106 +3,620 @@ Simplified AutoGen Demo - Interview Platform Product Planning
 
 This is a lightweight version for quick testing and understanding the workflow.
 It demonstrates multi-agent collaboration by having each agent generate responses.
+
+API calls are made with the async OpenAI client so that independent prompts
+(e.g. the per-competitor research prompts) run concurrently, bounded by
+Config.MAX_CONCURRENCY.
+
+By default the whole plan is requested in a single structured-output call
+(Config.SINGLE_CALL_PLAN); the per-phase workflow below is the fallback.
+
+Each phase output is condensed into a short summary. The summaries are kept in
+one append-only context block that leads every request, so consecutive calls
+share a byte-identical prompt prefix that the provider can serve from its
+prompt cache. Full outputs are fetched on demand through a lookup tool.
+
+Run with --batch to send the requests through the provider Batch API instead,
+one batch per wave of independent requests.
+
+Every completed phase is checkpointed to workflow_outputs_<run id>.jsonl. If a
+run fails part-way, rerun it with --resume <run id> to skip the phases that
+already finished.
 """
 
+import asyncio
+import io
 from datetime import datetime
+from functools import lru_cache
 from config import Config, WorkflowConfig
+from semantic_cache import SemanticCache
 import json
-import time
-
-# Try to import OpenAI client
-try:
-    from openai import OpenAI
-    # RateLimitError may be in different locations depending on OpenAI version
+import os
+import random
+import re
+import sys
+from pathlib import Path
+import httpx
+
+
+# Leads every request; phase summaries are appended after it as the workflow runs
+_CONTEXT_PREAMBLE = """You are one agent in a team planning a new AI-powered interview platform.
+Summaries of earlier phases of the workflow are shown below for reference."""
+
+# Each phase output is condensed before it is passed downstream
+_SUMMARY_SYSTEM_PROMPT = "Summarize the following text in 3 short bullet points. Keep names and numbers."
+_SUMMARY_MAX_TOKENS = 80
+
+# Lets an agent pull the full output of an earlier phase instead of receiving it inline
+_PHASE_LOOKUP_TOOL = {
+    "type": "function",
+    "function": {
+        "name": "get_phase_output",
+        "description": "Get the full output of an earlier workflow phase.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "phase": {
+                    "type": "string",
+                    "enum": WorkflowConfig.PHASES,
+                    "description": "Name of the phase, e.g. 'blueprint'",
+                },
+            },
+            "required": ["phase"],
+        },
+    },
+}
+_MAX_TOOL_ROUNDS = 3
+
+# Console banner; each banner block is emitted with a single print call
+_BANNER = "=" * 80
+
+# Section titles used in the console banners and the saved report
+_PHASE_TITLES = {
+    "research": "MARKET RESEARCH",
+    "analysis": "OPPORTUNITY ANALYSIS",
+    "blueprint": "PRODUCT BLUEPRINT",
+    "technical": "TECHNICAL ARCHITECTURE",
+    "review": "STRATEGIC REVIEW",
+}
+
+
+def _phase_title(phase: str) -> str:
+    """Numbered title of a phase, e.g. 'PHASE 1: MARKET RESEARCH'"""
+    return f"PHASE {WorkflowConfig.PHASES.index(phase) + 1}: {_PHASE_TITLES[phase]}"
+
+
+def _print_banner(title: str, *lines: str):
+    """Print a banner-framed title and any following lines in one write"""
+    print("\n".join(["\n" + _BANNER, title, _BANNER, *lines]))
+
+
+# Connection pool shared by every API call of a workflow. HTTP/2 multiplexes the
+# concurrent requests over one connection when the optional h2 package is installed
+# (checked when a workflow creates its client, not at import).
+_HTTP_LIMITS = httpx.Limits(max_connections=50, max_keepalive_connections=20)
+
+# Rate limit detection, compiled once for the retry path
+_RATE_LIMIT_RE = re.compile(r'Please try again in ((?:[\d.]+(?:ms|h|m|s))+)')
+_RATE_LIMIT_TOKENS = ("rate_limit", "rate limit", "429")
+# Reset headers use durations such as "1m30.5s" or "120ms"
+_DURATION_RE = re.compile(r'([\d.]+)(ms|h|m|s)')
+_DURATION_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+_RATE_LIMIT_RESET_HEADERS = ("x-ratelimit-reset-requests", "x-ratelimit-reset-tokens")
+# Decorrelated jitter bounds (seconds) when the provider gives no wait time
+_BACKOFF_BASE = 1.0
+_BACKOFF_CAP = 60.0
+
+# Batch API mode: requests issued within the collect window form one batch (wave)
+_BATCH_COLLECT_DELAY = 0.5
+_BATCH_POLL_INTERVAL = 30
+_BATCH_TERMINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+
+class BatchRequestError(Exception):
+    """A request submitted through the Batch API failed or got no response"""
+
+
+def _is_rate_limit_error(error: Exception) -> bool:
+    """Check if an exception is a rate limit error (by type name or message content)"""
+    if type(error).__name__ == "RateLimitError":
+        return True
+    error_lower = str(error).lower()
+    return any(token in error_lower for token in _RATE_LIMIT_TOKENS)
+
+
+def _parse_duration(value: str):
+    """Parse a header value like "20", "1m30.5s" or "120ms" into seconds (None if unparseable)"""
     try:
-        from openai import RateLimitError
-    except ImportError:
-        try:
-            from openai.error import RateLimitError
-        except ImportError:
-            # Fallback: we'll catch it by checking error type
-            RateLimitError = None
-except ImportError:
-    print("ERROR: OpenAI client is not installed!")
-    print("Please run: pip install -r ../requirements.txt")
-    exit(1)
+        return float(value)
+    except ValueError:
+        parts = _DURATION_RE.findall(value)
+        if not parts:
+            return None
+        return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+def _rate_limit_wait(error: Exception):
+    """
+    Get how long the provider asks us to wait, in seconds.
+
+    Prefers the Retry-After response header, then the longest of the
+    x-ratelimit-reset-* headers (the request and token limits reset
+    independently, and both must have lifted), and falls back to the
+    "Please try again in ..." message text.
+
+    Returns:
+        float or None: Seconds to wait, or None if the error does not say
+    """
+    response = getattr(error, "response", None)
+    if response is not None:
+        value = response.headers.get("retry-after")
+        wait = _parse_duration(value) if value else None
+        if wait:
+            return wait
+        resets = [_parse_duration(value) for value in map(response.headers.get, _RATE_LIMIT_RESET_HEADERS) if value]
+        wait = max((reset for reset in resets if reset), default=None)
+        if wait:
+            return wait
+
+    time_match = _RATE_LIMIT_RE.search(str(error))
+    if time_match:
+        return _parse_duration(time_match.group(1))
+    return None
+
+
+_PLAN_SYSTEM_PROMPT = """You are a product planning team of five specialists: a market research
+analyst, a product analyst, a product designer, a technical architect and a product strategist.
+Work through the plan in order - each section builds on the sections before it - and return
+the result as a JSON object with one field per section."""
+
+
+@lru_cache(maxsize=None)
+def _plan_schema():
+    """
+    Build the structured-output model and response format of the single-call plan.
+
+    Built on first use rather than at import: only run_single_call() needs
+    pydantic and the generated JSON schema.
+
+    Returns:
+        tuple: (InterviewPlatformPlan model class, response_format request parameter)
+    """
+    from pydantic import BaseModel, ConfigDict, Field
+
+    class InterviewPlatformPlan(BaseModel):
+        """All five phase outputs, generated together in one structured-output call"""
+
+        model_config = ConfigDict(extra="forbid")
+
+        research: str = Field(description="Market research: key features of HireVue, Pymetrics and "
+                                          "Codility and the market gaps they leave (150 words)")
+        analysis: str = Field(description="3 key market opportunities or gaps for a new AI interview "
+                                          "platform, based on the research (150 words)")
+        blueprint: str = Field(description="Product blueprint: 3-5 key features and a 2-3 step user "
+                                           "journey addressing the opportunities (150 words)")
+        technical: str = Field(description="Technical architecture for the blueprint: technology stack, "
+                                           "key components and services, scalability (150 words)")
+        review: str = Field(description="3 strategic recommendations for success, reviewing the "
+                                        "blueprint and technical architecture (150 words)")
+
+    response_format = {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "interview_platform_plan",
+            "schema": InterviewPlatformPlan.model_json_schema(),
+            "strict": True,
+        },
+    }
+    return InterviewPlatformPlan, response_format
 
 
 class SimpleInterviewPlatformWorkflow:
     """Simplified workflow for interview platform planning"""
 
-    def __init__(self):
-        """Initialize the workflow"""
+    # Competitors covered by the research phase (one research prompt each)
+    COMPETITORS = ("HireVue", "Pymetrics", "Codility")
+
+    # Phase prompts, defined once. Prior phase summaries reach the agents through
+    # the shared context block, so only the review template has fields to fill.
+    _RESEARCH_SYS_TMPL = """You are a market research analyst. Provide a brief analysis of
+{competitor}, a competitor in AI interview platforms.
+List its key features and identify market gaps it leaves open in 50 words."""
+    _RESEARCH_USER = "Analyze this competitor in the market for AI-powered interview platforms."
+
+    _ANALYSIS_SYS = """You are a product analyst. Based on the market research provided,
+identify 3 key market opportunities or gaps for a new AI interview platform.
+Be concise in 150 words."""
+    _ANALYSIS_USER = "Using the market research findings above, identify market opportunities and gaps."
+
+    _BLUEPRINT_SYS = """You are a product designer. Based on the market analysis and opportunities,
+create a brief product blueprint including:
+- Key features (3-5)
+- User journey (2-3 steps)
+Keep it concise - 150 words."""
+    _BLUEPRINT_USER = "Using the market analysis above, create a product blueprint for our platform."
+
+    _TECHNICAL_SYS = """You are a technical architect. Based on the product blueprint provided,
+design a technical architecture including:
+- Technology stack (frontend, backend, database)
+- Key technical components and services
+- Scalability and performance considerations
+Keep it concise - 150 words."""
+    _TECHNICAL_USER = "Using the product blueprint above, design the technical architecture for this platform."
+
+    _REVIEW_SYS = """You are a product reviewer and strategist. Review the product blueprint
+and technical architecture, then provide 3 strategic recommendations for success.
+Be concise - 150 words."""
+    _REVIEW_USER_TMPL = """Completed phases:
+{toc}
+
+Using the product blueprint and technical architecture summarized above, provide strategic
+review and recommendations. Call get_phase_output if you need the full text of a phase."""
+
+    def __init__(self, max_concurrency: int = Config.MAX_CONCURRENCY,
+                 http_client: httpx.AsyncClient = None, batch: bool = False,
+                 run_id: str = None):
+        """
+        Initialize the workflow
+
+        Args:
+            max_concurrency: Maximum number of API calls in flight at once
+            http_client: Pooled HTTP client to share across workflows; one is
+                created (and closed by aclose()) when not given
+            batch: Send requests through the provider Batch API (lower cost,
+                higher latency) instead of streaming them
+            run_id: Identifier of the run (defaults to the start timestamp); phases
+                checkpointed under an existing run id are loaded instead of rerun
+        """
         if not Config.validate_setup():
             print("ERROR: Configuration validation failed!")
             exit(1)
 
-        self.client = OpenAI(api_key=Config.API_KEY, base_url=Config.API_BASE)
+        # Imported here so importing this module stays cheap
+        from importlib.util import find_spec
+
+        self._owns_http = http_client is None
+        self.http = http_client or httpx.AsyncClient(
+            http2=find_spec("h2") is not None,
+            limits=_HTTP_LIMITS,
+            timeout=httpx.Timeout(Config.AGENT_TIMEOUT),
+        )
+        try:
+            from openai import AsyncOpenAI
+        except ImportError:
+            print("ERROR: OpenAI client is not installed!")
+            print("Please run: pip install -r ../requirements.txt")
+            exit(1)
+        self.client = AsyncOpenAI(api_key=Config.API_KEY, base_url=Config.API_BASE, http_client=self.http)
         self.outputs = {}
+        self.summaries = {}
+        # Shared, append-only prompt prefix holding summaries of completed phases
+        self._context_buf = io.StringIO(_CONTEXT_PREAMBLE)
+        self._context_buf.seek(0, io.SEEK_END)
+        self.usage = {"prompt_tokens": 0, "cached_tokens": 0}
         self.model = Config.OPENAI_MODEL
+        # Timestamps are taken once: here and at the end of the workflow
+        self._start = datetime.now()
+        self._start_str = self._start.strftime('%Y-%m-%d %H:%M:%S')
+        self._timestamp = self._start.strftime('%Y%m%d_%H%M%S')
+        self.max_concurrency = max_concurrency
+        # Created in run() so it is bound to the running event loop
+        self._semaphore = None
+        self.batch = batch
+        self._batch_pending = []
+        self._batch_flush = None  # Flush still collecting the next wave
+        self._batch_flushes = set()  # Every flush in progress, so none is garbage collected
+        self._batch_count = 0
+        self.cache = None
+        if Config.CACHE_ENABLED and Config.AGENT_TEMPERATURE <= Config.CACHE_MAX_TEMPERATURE:
+            self.cache = SemanticCache(Config.CACHE_PATH, threshold=Config.CACHE_SIMILARITY)
+        self.run_id = run_id or self._timestamp
+        self._checkpoint_path = Path(f"workflow_outputs_{self.run_id}.jsonl")
+        self.resumed = self._load_checkpoint()
+        self.single_call = False  # Set once the single structured-output call produced the plan
+
+    async def aclose(self):
+        """Close the HTTP connection pool if this workflow created it, and the response cache"""
+        if self._owns_http:
+            await self.http.aclose()
+        if self.cache is not None:
+            self.cache.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    def _phase_key(self, phase: str) -> str:
+        """Checkpoint key of a phase: changes whenever its prompts or the model change"""
+        prompts = {
+            "research": (self._RESEARCH_SYS_TMPL, self._RESEARCH_USER, *self.COMPETITORS),
+            "analysis": (self._ANALYSIS_SYS, self._ANALYSIS_USER),
+            "blueprint": (self._BLUEPRINT_SYS, self._BLUEPRINT_USER),
+            "technical": (self._TECHNICAL_SYS, self._TECHNICAL_USER),
+            "review": (self._REVIEW_SYS, self._REVIEW_USER_TMPL),
+        }
+        return SemanticCache.make_key(self.model, _SUMMARY_SYSTEM_PROMPT, *prompts[phase])
+
+    def _load_checkpoint(self) -> list:
+        """
+        Load the phases completed by an earlier attempt of this run.
+
+        Records whose key no longer matches the current prompts are ignored,
+        so those phases run again.
 
-    def _make_api_call(self, system_prompt: str, user_message: str, max_retries: int = 3):
+        Returns:
+            list: Names of the phases loaded, in completion order
         """
-        Make an API call with rate limit retry logic.
-        
+        if not self._checkpoint_path.exists():
+            return []
+        with open(self._checkpoint_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Partial line left by a crash mid-write
+                phase = record.get("phase")
+                if phase not in WorkflowConfig.PHASES or phase in self.outputs:
+                    continue
+                if record.get("key") != self._phase_key(phase):
+                    continue
+                self.outputs[phase] = record["content"]
+                if record.get("summary") is not None:
+                    self._append_summary(phase, record["summary"])
+        return list(self.outputs)
+
+    def _write_checkpoint(self, record: dict):
+        """Append one phase record to the checkpoint file and force it to disk"""
+        with open(self._checkpoint_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _append_summary(self, phase: str, summary: str):
+        """Add a phase summary to the shared context block"""
+        self.summaries[phase] = summary
+        title = WorkflowConfig.get_phase_description(phase).upper()
+        self._context_buf.write(f"\n\n### {title} ({phase})\n{summary}")
+
+    async def _add_context(self, phase: str, content: str):
+        """
+        Record a phase output and append its summary to the shared context block.
+
+        Downstream phases see only the summary; the full text stays in
+        self.outputs and can be fetched on demand through the phase lookup tool.
+        The output and summary are checkpointed before returning.
+        """
+        self.outputs[phase] = content
+        summary = None
+        is_consumed = any(phase in deps for deps in WorkflowConfig.PHASE_DEPENDENCIES.values())
+        if is_consumed:
+            summary = await self._make_api_call(
+                _SUMMARY_SYSTEM_PROMPT, content,
+                echo=False, max_tokens=_SUMMARY_MAX_TOKENS, with_context=False,
+            )
+            self._append_summary(phase, summary)
+        await asyncio.to_thread(self._write_checkpoint, {
+            "phase": phase,
+            "key": self._phase_key(phase),
+            "content": content,
+            "summary": summary,
+        })
+
+    @property
+    def context_blob(self) -> str:
+        """The shared context block: preamble followed by the completed phase summaries"""
+        return self._context_buf.getvalue()
+
+    def _table_of_contents(self) -> str:
+        """One line per completed phase, for prompts that look up full outputs on demand"""
+        return "\n".join(
+            f"- {phase}: {WorkflowConfig.get_phase_description(phase)}"
+            for phase in self.outputs
+        )
+
+    def _lookup_phase_output(self, arguments: str) -> str:
+        """Resolve a get_phase_output tool call to the full text of that phase"""
+        try:
+            phase = json.loads(arguments or "{}").get("phase", "")
+        except json.JSONDecodeError:
+            phase = ""
+        if phase not in self.outputs:
+            return f"Unknown phase '{phase}'. Available phases: {', '.join(self.outputs)}"
+        return self.outputs[phase]
+
+    def _build_messages(self, system_prompt: str, user_message: str, with_context: bool = True) -> list:
+        """
+        Build the chat messages with the cacheable context block first.
+
+        The context block only ever grows by appending, so each request's
+        prefix matches the previous request's and hits the provider cache.
+        Only the agent role and the instruction differ between calls.
+        """
+        if not with_context:
+            system_content = system_prompt
+        elif Config.PROMPT_CACHE_CONTROL:
+            system_content = [
+                {"type": "text", "text": self.context_blob, "cache_control": {"type": "ephemeral"}},
+                {"type": "text", "text": system_prompt},
+            ]
+        else:
+            system_content = f"{self.context_blob}\n\n---\n\n{system_prompt}"
+        return [
+            {"role": "system", "content": system_content},
+            {"role": "user", "content": user_message}
+        ]
+
+    def _cache_entry(self, messages: list, params: dict, system_prompt: str, user_message: str,
+                     with_context: bool) -> tuple:
+        """
+        Build the response cache key, semantic scope and embedded text of a request.
+
+        The exact key covers the full request. The scope covers everything that
+        is not embedded (model, request parameters, agent role), so a semantic
+        hit is always an answer to the same kind of request. Only the variable
+        part is embedded, instruction first: the embedding model truncates long
+        input, and the shared context is what should be cut off, not the
+        instruction that tells the phases apart.
+
+        Returns:
+            tuple: (key, scope, text)
+        """
+        key = SemanticCache.make_key(json.dumps(messages, sort_keys=True), json.dumps(params, sort_keys=True))
+        scope = SemanticCache.make_key(json.dumps(params, sort_keys=True), system_prompt, with_context)
+        text = f"{user_message}\n\n{self.context_blob}" if with_context else user_message
+        return key, scope, text
+
+    def _record_usage(self, usage):
+        """Accumulate prompt token usage, including tokens served from the prompt cache"""
+        if usage is None:
+            return
+        self.usage["prompt_tokens"] += usage.prompt_tokens or 0
+        details = getattr(usage, "prompt_tokens_details", None)
+        self.usage["cached_tokens"] += getattr(details, "cached_tokens", None) or 0
+
+    async def _make_api_call(self, system_prompt: str, user_message: str, max_retries: int = 3,
+                             echo: bool = True, max_tokens: int = None, with_context: bool = True,
+                             lookup: bool = False):
+        """
+        Make a streaming API call, resolving phase lookup tool calls if enabled.
+
+        Responses are served from (and saved to) the response cache when it is
+        enabled.
+
         Args:
             system_prompt: System message for the API call
             user_message: User message for the API call
+            max_retries: Maximum number of retry attempts per request
+            echo: Print tokens to the console as they stream in
+            max_tokens: Completion token limit (defaults to Config.AGENT_MAX_TOKENS)
+            with_context: Prefix the shared context block of prior phase summaries
+            lookup: Offer the get_phase_output tool so the model can fetch
+                full prior phase outputs on demand
+
+        Returns:
+            str: The full response text
+        """
+        messages = self._build_messages(system_prompt, user_message, with_context)
+        params = {
+            "model": self.model,
+            "temperature": Config.AGENT_TEMPERATURE,
+            "max_tokens": max_tokens or Config.AGENT_MAX_TOKENS,
+        }
+        if lookup:
+            params["tools"] = [_PHASE_LOOKUP_TOOL]
+
+        if self.cache is None:
+            return await self._complete_with_tools(messages, params, echo, max_retries)
+
+        key, scope, text = self._cache_entry(messages, params, system_prompt, user_message, with_context)
+        cached = await asyncio.to_thread(self.cache.get, key, text, scope)
+        if cached is not None:
+            if echo:
+                print(cached)
+            return cached
+
+        response = await self._complete_with_tools(messages, params, echo, max_retries)
+        await asyncio.to_thread(self.cache.put, key, text, response, scope)
+        return response
+
+    async def _complete_with_tools(self, messages: list, params: dict, echo: bool, max_retries: int):
+        """Run a completion, answering get_phase_output tool calls until the model replies"""
+        for _ in range(_MAX_TOOL_ROUNDS):
+            text, tool_calls = await self._create_completion(messages, params, echo, max_retries)
+            if not tool_calls:
+                return text
+            messages.append({"role": "assistant", "content": text or None, "tool_calls": tool_calls})
+            for call in tool_calls:
+                messages.append({
+                    "role": "tool",
+                    "tool_call_id": call["id"],
+                    "content": self._lookup_phase_output(call["function"]["arguments"]),
+                })
+
+        # Out of lookup rounds: ask for the answer without offering the tool again
+        params.pop("tools", None)
+        text, _ = await self._create_completion(messages, params, echo, max_retries)
+        return text
+
+    async def _create_completion(self, messages: list, params: dict, echo: bool, max_retries: int):
+        """
+        Make a single streaming completion request with rate limit retry logic.
+
+        Tokens are printed as they arrive (when echo is set) and accumulated
+        into the returned text.
+        
+        Args:
+            messages: Chat messages for the request
+            params: Remaining request parameters (model, temperature, tools, ...)
+            echo: Print tokens to the console as they stream in
             max_retries: Maximum number of retry attempts
             
         Returns:
-            API response object
+            tuple: (response text, list of tool calls requested by the model)
             
         Raises:
             RateLimitError: If rate limit is exceeded and cannot be retried
             Exception: For other API errors
         """
+        if self.batch:
+            return await self._submit_to_batch(messages, params, echo)
+
+        backoff = _BACKOFF_BASE
         for attempt in range(max_retries):
             try:
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    temperature=Config.AGENT_TEMPERATURE,
-                    max_tokens=Config.AGENT_MAX_TOKENS,
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_message}
-                    ]
-                )
-                return response
+                # Limit the number of requests in flight to respect provider rate limits
+                async with self._semaphore:
+                    stream = await self.client.chat.completions.create(
+                        messages=messages,
+                        stream=True,
+                        stream_options={"include_usage": True},
+                        **params
+                    )
+                    tokens = []
+                    tool_calls = {}
+                    async for chunk in stream:
+                        # The final chunk carries usage and no choices
+                        self._record_usage(getattr(chunk, "usage", None))
+                        if not chunk.choices:
+                            continue
+                        delta = chunk.choices[0].delta
+                        # Tool calls arrive as fragments keyed by index
+                        for fragment in delta.tool_calls or ():
+                            call = tool_calls.setdefault(fragment.index, {
+                                "id": "", "type": "function",
+                                "function": {"name": "", "arguments": ""},
+                            })
+                            call["id"] = fragment.id or call["id"]
+                            if fragment.function:
+                                call["function"]["name"] += fragment.function.name or ""
+                                call["function"]["arguments"] += fragment.function.arguments or ""
+                        if delta.content:
+                            tokens.append(delta.content)
+                            if echo:
+                                print(delta.content, end="", flush=True)
+                if echo and tokens:
+                    print()
+                return "".join(tokens), [tool_calls[index] for index in sorted(tool_calls)]
             except Exception as e:
                 error_str = str(e)
-                error_type = type(e).__name__
-                
-                # Check if it's a rate limit error (by name or message content)
-                is_rate_limit = (
-                    error_type == "RateLimitError" or 
-                    "rate_limit" in error_str.lower() or 
-                    "rate limit" in error_str.lower() or
-                    "429" in error_str
-                )
-                
-                if is_rate_limit:
-                    # Try to extract wait time from error message
-                    wait_time = 60  # Default wait time in seconds
-                    
-                    if "Please try again in" in error_str:
-                        # Extract wait time from error message (e.g., "Please try again in 3m23.04s")
-                        import re
-                        time_match = re.search(r'Please try again in ([\d.]+)([smh])', error_str)
-                        if time_match:
-                            value = float(time_match.group(1))
-                            unit = time_match.group(2)
-                            if unit == 's':
-                                wait_time = int(value) + 5  # Add 5 second buffer
-                            elif unit == 'm':
-                                wait_time = int(value * 60) + 10  # Add 10 second buffer
-                            elif unit == 'h':
-                                wait_time = int(value * 3600) + 60  # Add 1 minute buffer
-                    
+
+                if _is_rate_limit_error(e):
+                    wait_time = _rate_limit_wait(e)
+                    if wait_time is not None:
+                        # Wake up when the limit lifts; jitter spreads out concurrent retries,
+                        # and only ever adds time so no retry fires before the reset
+                        wait_time *= random.uniform(1.0, 1.3)
+                    else:
+                        # Decorrelated jitter backoff
+                        wait_time = min(_BACKOFF_CAP, random.uniform(_BACKOFF_BASE, backoff * 3))
+                    backoff = wait_time
+
                     if attempt < max_retries - 1:
-                        print(f"\n⚠️  Rate limit reached. Waiting {wait_time} seconds before retry {attempt + 1}/{max_retries}...")
-                        print(f"   Error: {error_str[:200]}...")
-                        time.sleep(wait_time)
+                        print(f"\n⚠️  Rate limit reached. Waiting {wait_time:.1f} seconds before retry {attempt + 1}/{max_retries}...\n"
+                              f"   Error: {error_str[:200]}...", flush=True)
+                        await asyncio.sleep(wait_time)
                     else:
                         print(f"\n❌ Rate limit error after {max_retries} attempts:")
                         print(f"   {error_str}")
@@ -117,149 +631,285 @@ class SimpleInterviewPlatformWorkflow:
                     # For other errors, raise immediately
                     raise
 
-    def run(self):
-        """Execute the complete workflow"""
-        print("\n" + "="*80)
-        print("AUTOGEN INTERVIEW PLATFORM WORKFLOW - SIMPLIFIED DEMO")
-        print("="*80)
-        print(f"Start Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"Model: {self.model}\n")
+    async def _submit_to_batch(self, messages: list, params: dict, echo: bool):
+        """
+        Queue a request for the next Batch API submission and wait for its result.
+
+        Requests made while the current wave is being collected (e.g. the
+        concurrent per-competitor research prompts) share one batch; a request
+        that depends on an earlier result naturally lands in a later wave.
 
-        # Phase 1: Research
-        self.phase_research()
+        Returns:
+            tuple: (response text, list of tool calls requested by the model)
 
-        # Phase 2: Analysis
-        self.phase_analysis()
+        Raises:
+            BatchRequestError: If the batch or this request within it failed
+        """
+        self._batch_count += 1
+        body = {"messages": messages, **params}
+        future = asyncio.get_running_loop().create_future()
+        self._batch_pending.append((f"request-{self._batch_count}", body, future))
+        if self._batch_flush is None:
+            self._batch_flush = asyncio.create_task(self._flush_batch())
+            self._batch_flushes.add(self._batch_flush)
+            self._batch_flush.add_done_callback(self._batch_flushes.discard)
+
+        from openai.types.chat import ChatCompletion
+
+        response = ChatCompletion.model_validate(await future)
+        self._record_usage(response.usage)
+        message = response.choices[0].message
+        text = message.content or ""
+        if echo and text:
+            print(text)
+        tool_calls = [call.model_dump() for call in message.tool_calls or ()]
+        return text, tool_calls
+
+    async def _flush_batch(self):
+        """Submit the collected wave as one batch job, poll it, and resolve its requests"""
+        await asyncio.sleep(_BATCH_COLLECT_DELAY)
+        # Requests queued from here on start the next wave's flush instead of
+        # waiting for this batch to finish polling
+        wave, self._batch_pending = self._batch_pending, []
+        self._batch_flush = None
+        futures = {custom_id: future for custom_id, _, future in wave}
 
-        # Phase 3: Blueprint
-        self.phase_blueprint()
+        try:
+            lines = [
+                json.dumps({"custom_id": custom_id, "method": "POST",
+                            "url": "/v1/chat/completions", "body": body})
+                for custom_id, body, _ in wave
+            ]
+            batch_file = await self.client.files.create(
+                file=("batch.jsonl", "\n".join(lines).encode("utf-8")),
+                purpose="batch",
+            )
+            batch = await self.client.batches.create(
+                input_file_id=batch_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h",
+            )
+            print(f"\n📦 Submitted batch {batch.id} with {len(wave)} request(s); polling...", flush=True)
+            while batch.status not in _BATCH_TERMINAL_STATUSES:
+                await asyncio.sleep(_BATCH_POLL_INTERVAL)
+                batch = await self.client.batches.retrieve(batch.id)
+            if batch.status != "completed":
+                raise BatchRequestError(f"Batch {batch.id} ended with status '{batch.status}'")
+
+            results = []
+            for file_id in (batch.output_file_id, batch.error_file_id):
+                if file_id:
+                    content = await self.client.files.content(file_id)
+                    results.extend(json.loads(line) for line in content.text.splitlines() if line)
+        except Exception as e:
+            for future in futures.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for result in results:
+            future = futures.get(result.get("custom_id"))
+            if future is None or future.done():
+                continue
+            response = result.get("response") or {}
+            if response.get("status_code") == 200:
+                future.set_result(response["body"])
+            else:
+                error = result.get("error") or response.get("body")
+                future.set_exception(BatchRequestError(f"{result['custom_id']} failed: {error}"))
+        for custom_id, future in futures.items():
+            if not future.done():
+                future.set_exception(BatchRequestError(f"{custom_id} missing from batch output"))
+
+    async def run(self):
+        """Execute the complete workflow"""
+        _print_banner(
+            "AUTOGEN INTERVIEW PLATFORM WORKFLOW - SIMPLIFIED DEMO",
+            f"Start Time: {self._start_str}",
+            f"Run ID: {self.run_id}",
+            f"Model: {self.model}\n",
+        )
+        if self.resumed:
+            print(f"Resuming run: skipping completed phases {', '.join(self.resumed)}\n")
+        sys.stdout.flush()
 
-        # Phase 4: Technical Architecture
-        self.phase_technical()
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
 
-        # Phase 5: Review
-        self.phase_review()
+        # Try to generate the whole plan in one round trip first (unless resuming)
+        self.single_call = not self.resumed and Config.SINGLE_CALL_PLAN and await self.run_single_call()
+        if not self.single_call:
+            # Phases 1-5: Research -> Analysis -> Blueprint -> Technical -> Review
+            await self._run_dag(WorkflowConfig.PHASE_DEPENDENCIES)
 
         # Summary
         self.print_summary()
 
-    def phase_research(self):
-        """Phase 1: Market Research"""
-        print("\n" + "="*80)
-        print("PHASE 1: MARKET RESEARCH")
-        print("="*80)
-        print("[ResearchAgent is analyzing the market...]")
-
-        system_prompt = """You are a market research analyst. Provide a brief analysis of
-3 competitors in AI interview platforms (HireVue, Pymetrics, Codility).
-List their key features and identify market gaps in 150 words."""
+    async def run_single_call(self) -> bool:
+        """
+        Generate all five phases in a single structured-output API call.
 
-        user_message = "Analyze the current market for AI-powered interview platforms."
+        Returns:
+            bool: True if the plan was generated, False if the model does not
+            support structured output (the caller then runs the phases one by one)
+        """
+        from openai import BadRequestError
+        from pydantic import ValidationError
+
+        plan_model, response_format = _plan_schema()
+        print("\n[Generating the full plan in a single structured-output call...]")
+        user_message = "Create the complete product plan for our AI-powered interview platform."
+        messages = self._build_messages(_PLAN_SYSTEM_PROMPT, user_message, with_context=False)
+        params = {
+            "model": self.model,
+            "temperature": Config.AGENT_TEMPERATURE,
+            "max_tokens": Config.AGENT_MAX_TOKENS,
+            "response_format": response_format,
+        }
+        text = None
+        if self.cache is not None:
+            key, scope, prompt_text = self._cache_entry(messages, params, _PLAN_SYSTEM_PROMPT, user_message,
+                                                        with_context=False)
+            text = await asyncio.to_thread(self.cache.get, key, prompt_text, scope)
+        cached = text is not None
+        try:
+            if not cached:
+                text, _ = await self._create_completion(messages, params, echo=False, max_retries=3)
+            plan = plan_model.model_validate_json(text)
+        except (BadRequestError, BatchRequestError, ValidationError) as e:
+            print(f"⚠️  Structured output unavailable ({type(e).__name__}); running phases separately.")
+            return False
+        # Only cache plans that validated, so a malformed answer is not replayed
+        if self.cache is not None and not cached:
+            await asyncio.to_thread(self.cache.put, key, prompt_text, text, scope)
+
+        # Keep the phase-by-phase console output of the multi-call workflow
+        for phase in WorkflowConfig.PHASES:
+            self.outputs[phase] = getattr(plan, phase)
+            _print_banner(_phase_title(phase), self.outputs[phase])
+        sys.stdout.flush()
+        return True
+
+    async def _run_dag(self, dependencies: dict):
+        """
+        Run phases as a dependency graph.
 
-        response = self._make_api_call(system_prompt, user_message)
-        self.outputs["research"] = response.choices[0].message.content
-        print("\n[ResearchAgent Output]")
-        print(self.outputs["research"])
+        Every phase whose dependencies are satisfied is started at once; the
+        scheduler then waits for the first running phase to finish and starts
+        whatever that unblocks. A phase's result is only waited on by the
+        phases that consume it, so wall-clock time follows the critical path.
 
-    def phase_analysis(self):
-        """Phase 2: Opportunity Analysis"""
-        print("\n" + "="*80)
-        print("PHASE 2: OPPORTUNITY ANALYSIS")
-        print("="*80)
-        print("[AnalysisAgent is identifying opportunities...]")
-
-        system_prompt = """You are a product analyst. Based on the market research provided,
-identify 3 key market opportunities or gaps for a new AI interview platform.
-Be concise in 150 words."""
+        Args:
+            dependencies: Mapping of phase name to the set of phases it depends on
 
-        user_message = f"""Market research findings:
-{self.outputs['research']}
+        Raises:
+            ValueError: If some phases can never be scheduled (cycle or unknown dependency)
+        """
+        # Phases loaded from a checkpoint count as already completed
+        completed = {phase for phase in dependencies if phase in self.outputs}
+        pending = {phase: set(deps) for phase, deps in dependencies.items() if phase not in completed}
+        running = {}
 
-Now identify market opportunities and gaps."""
+        try:
+            while pending or running:
+                # Submit every phase that is ready...
+                ready = [phase for phase, deps in pending.items() if deps <= completed]
+                for phase in ready:
+                    del pending[phase]
+                    task = asyncio.create_task(getattr(self, f"phase_{phase}")())
+                    running[task] = phase
+
+                if not running:
+                    raise ValueError(f"Unsatisfiable phase dependencies: {sorted(pending)}")
+
+                # ...then collect, waking up as soon as any one of them finishes
+                finished, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in finished:
+                    completed.add(running.pop(task))
+                    task.result()  # Re-raise errors from the phase
+        finally:
+            for task in running:
+                task.cancel()
+
+    async def phase_research(self):
+        """Phase 1: Market Research"""
+        _print_banner(_phase_title("research"), "[ResearchAgent is analyzing the market...]")
+
+        # One prompt per competitor, all in flight at once (not echoed, as the
+        # streams would interleave on the console)
+        tasks = [
+            asyncio.create_task(self._make_api_call(
+                self._RESEARCH_SYS_TMPL.format(competitor=competitor),
+                self._RESEARCH_USER,
+                echo=False,
+            ))
+            for competitor in self.COMPETITORS
+        ]
+        responses = await asyncio.gather(*tasks)
+
+        await self._add_context("research", "\n\n".join(
+            f"{competitor}:\n{response}"
+            for competitor, response in zip(self.COMPETITORS, responses)
+        ))
+        print(f"\n[ResearchAgent Output]\n{self.outputs['research']}")
+        sys.stdout.flush()
+
+    async def phase_analysis(self):
+        """Phase 2: Opportunity Analysis"""
+        _print_banner(_phase_title("analysis"), "[AnalysisAgent is identifying opportunities...]")
 
-        response = self._make_api_call(system_prompt, user_message)
-        self.outputs["analysis"] = response.choices[0].message.content
         print("\n[AnalysisAgent Output]")
-        print(self.outputs["analysis"])
+        await self._add_context("analysis", await self._make_api_call(self._ANALYSIS_SYS, self._ANALYSIS_USER))
+        sys.stdout.flush()
 
-    def phase_blueprint(self):
+    async def phase_blueprint(self):
         """Phase 3: Product Blueprint"""
-        print("\n" + "="*80)
-        print("PHASE 3: PRODUCT BLUEPRINT")
-        print("="*80)
-        print("[BlueprintAgent is designing the product...]")
+        _print_banner(_phase_title("blueprint"), "[BlueprintAgent is designing the product...]")
 
-        system_prompt = """You are a product designer. Based on the market analysis and opportunities,
-create a brief product blueprint including:
-- Key features (3-5)
-- User journey (2-3 steps)
-Keep it concise - 150 words."""
-
-        user_message = f"""Market Analysis:
-{self.outputs['analysis']}
-
-Create a product blueprint for our platform."""
-
-        response = self._make_api_call(system_prompt, user_message)
-        self.outputs["blueprint"] = response.choices[0].message.content
         print("\n[BlueprintAgent Output]")
-        print(self.outputs["blueprint"])
+        await self._add_context("blueprint", await self._make_api_call(self._BLUEPRINT_SYS, self._BLUEPRINT_USER))
+        sys.stdout.flush()
 
-    def phase_technical(self):
+    async def phase_technical(self):
         """Phase 4: Technical Architecture"""
-        print("\n" + "="*80)
-        print("PHASE 4: TECHNICAL ARCHITECTURE")
-        print("="*80)
-        print("[TechnicalArchitectAgent is designing the architecture...]")
-
-        system_prompt = """You are a technical architect. Based on the product blueprint provided,
-design a technical architecture including:
-- Technology stack (frontend, backend, database)
-- Key technical components and services
-- Scalability and performance considerations
-Keep it concise - 150 words."""
+        _print_banner(_phase_title("technical"), "[TechnicalArchitectAgent is designing the architecture...]")
 
-        user_message = f"""Product Blueprint:
-{self.outputs['blueprint']}
-
-Design the technical architecture for this platform."""
-
-        response = self._make_api_call(system_prompt, user_message)
-        self.outputs["technical"] = response.choices[0].message.content
         print("\n[TechnicalArchitectAgent Output]")
-        print(self.outputs["technical"])
+        await self._add_context("technical", await self._make_api_call(self._TECHNICAL_SYS, self._TECHNICAL_USER))
+        sys.stdout.flush()
 
-    def phase_review(self):
+    async def phase_review(self):
         """Phase 5: Strategic Review"""
-        print("\n" + "="*80)
-        print("PHASE 5: STRATEGIC REVIEW")
-        print("="*80)
-        print("[ReviewerAgent is providing recommendations...]")
-
-        system_prompt = """You are a product reviewer and strategist. Review the product blueprint
-and technical architecture, then provide 3 strategic recommendations for success.
-Be concise - 150 words."""
-
-        user_message = f"""Product Blueprint:
-{self.outputs['blueprint']}
-
-Technical Architecture:
-{self.outputs['technical']}
+        _print_banner(_phase_title("review"), "[ReviewerAgent is providing recommendations...]")
 
-Provide strategic review and recommendations."""
+        user_message = self._REVIEW_USER_TMPL.format_map({"toc": self._table_of_contents()})
 
-        response = self._make_api_call(system_prompt, user_message)
-        self.outputs["review"] = response.choices[0].message.content
         print("\n[ReviewerAgent Output]")
-        print(self.outputs["review"])
+        await self._add_context("review", await self._make_api_call(self._REVIEW_SYS, user_message, lookup=True))
+        sys.stdout.flush()
+
+    def _format_full_report(self) -> str:
+        """Format the full output of every phase, shared by the console summary and the saved file"""
+        sections = []
+        for phase in WorkflowConfig.PHASES:
+            sections.extend([
+                "",
+                "-"*80,
+                _phase_title(phase),
+                "-"*80,
+                self.outputs[phase],
+            ])
+        return "\n".join(sections) + "\n"
 
     def print_summary(self):
         """Print final summary"""
-        print("\n" + "="*80)
-        print("FINAL SUMMARY")
-        print("="*80)
-
-        print("""
+        if self.single_call:
+            _print_banner("FINAL SUMMARY", """
+This workflow generated all five phases in a single structured-output call:
+one request played the research analyst, product analyst, designer,
+technical architect and strategist, each section building on the ones before.
+""")
+        else:
+            _print_banner("FINAL SUMMARY", """
 This workflow demonstrated a 5-agent collaboration:
 1. ResearchAgent - Analyzed the market
 2. AnalysisAgent - Identified opportunities
@@ -272,94 +922,64 @@ demonstrating the sequential workflow pattern of AutoGen.
 """)
 
         # Print full results
-        print("\n" + "="*80)
-        print("FULL RESULTS - ALL PHASES")
-        print("="*80)
-        
-        print("\n" + "-"*80)
-        print("PHASE 1: MARKET RESEARCH (Full Output)")
-        print("-"*80)
-        print(self.outputs["research"])
-        
-        print("\n" + "-"*80)
-        print("PHASE 2: OPPORTUNITY ANALYSIS (Full Output)")
-        print("-"*80)
-        print(self.outputs["analysis"])
-        
-        print("\n" + "-"*80)
-        print("PHASE 3: PRODUCT BLUEPRINT (Full Output)")
-        print("-"*80)
-        print(self.outputs["blueprint"])
-        
-        print("\n" + "-"*80)
-        print("PHASE 4: TECHNICAL ARCHITECTURE (Full Output)")
-        print("-"*80)
-        print(self.outputs["technical"])
-        
-        print("\n" + "-"*80)
-        print("PHASE 5: STRATEGIC REVIEW (Full Output)")
-        print("-"*80)
-        print(self.outputs["review"])
-
-        # Save to file
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        output_file = f"workflow_outputs_{timestamp}.txt"
-        with open(output_file, 'w') as f:
-            f.write("="*80 + "\n")
-            f.write("AUTOGEN INTERVIEW PLATFORM WORKFLOW - FULL RESULTS\n")
-            f.write("="*80 + "\n")
-            f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"Model: {self.model}\n\n")
-            
-            f.write("\n" + "-"*80 + "\n")
-            f.write("PHASE 1: MARKET RESEARCH\n")
-            f.write("-"*80 + "\n")
-            f.write(self.outputs["research"] + "\n")
-            
-            f.write("\n" + "-"*80 + "\n")
-            f.write("PHASE 2: OPPORTUNITY ANALYSIS\n")
-            f.write("-"*80 + "\n")
-            f.write(self.outputs["analysis"] + "\n")
-            
-            f.write("\n" + "-"*80 + "\n")
-            f.write("PHASE 3: PRODUCT BLUEPRINT\n")
-            f.write("-"*80 + "\n")
-            f.write(self.outputs["blueprint"] + "\n")
-            
-            f.write("\n" + "-"*80 + "\n")
-            f.write("PHASE 4: TECHNICAL ARCHITECTURE\n")
-            f.write("-"*80 + "\n")
-            f.write(self.outputs["technical"] + "\n")
-            
-            f.write("\n" + "-"*80 + "\n")
-            f.write("PHASE 5: STRATEGIC REVIEW\n")
-            f.write("-"*80 + "\n")
-            f.write(self.outputs["review"] + "\n")
+        report = self._format_full_report()
+        _print_banner("FULL RESULTS - ALL PHASES", report)
+
+        # Save to file: build the whole document, then write it once
+        end_str = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        output_file = f"workflow_outputs_{self.run_id}.txt"
+        document = "\n".join([
+            _BANNER,
+            "AUTOGEN INTERVIEW PLATFORM WORKFLOW - FULL RESULTS",
+            _BANNER,
+            f"Generated: {end_str}",
+            f"Model: {self.model}",
+            "",
+            report,
+        ])
+        with open(output_file, 'w', buffering=1 << 16) as f:
+            f.write(document)
         
         print(f"\n💾 Full results saved to: {output_file}")
 
-        print(f"\nEnd Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print("="*80)
+        prompt_tokens = self.usage["prompt_tokens"]
+        if prompt_tokens:
+            cached = self.usage["cached_tokens"]
+            print(f"\nPrompt cache: {cached}/{prompt_tokens} prompt tokens cached "
+                  f"({cached / prompt_tokens:.0%} hit rate)")
+
+        print(f"\nEnd Time: {end_str}\n{_BANNER}")
+        sys.stdout.flush()
+
+
+async def main(batch: bool = False, run_id: str = None):
+    """Run the workflow and release its connection pool afterwards"""
+    async with SimpleInterviewPlatformWorkflow(batch=batch, run_id=run_id) as workflow:
+        await workflow.run()
 
 
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="AutoGen interview platform planning demo")
+    parser.add_argument("--batch", action="store_true",
+                        help="Use the provider Batch API (about 50%% cheaper, results may take "
+                             "minutes to hours) for scheduled, non-interactive runs")
+    parser.add_argument("--resume", metavar="RUN_ID",
+                        help="Resume an earlier run, skipping the phases it already completed")
+    args = parser.parse_args()
+
+    # Block-buffer the console; the workflow flushes at the end of each phase
+    if hasattr(sys.stdout, "reconfigure"):
+        sys.stdout.reconfigure(line_buffering=False, write_through=False)
+
     try:
-        workflow = SimpleInterviewPlatformWorkflow()
-        workflow.run()
+        asyncio.run(main(batch=args.batch, run_id=args.resume))
         print("\n✅ Workflow completed successfully!")
     except Exception as e:
         error_str = str(e)
-        error_type = type(e).__name__
-        
-        # Check if it's a rate limit error
-        is_rate_limit = (
-            error_type == "RateLimitError" or 
-            "rate_limit" in error_str.lower() or 
-            "rate limit" in error_str.lower() or
-            "429" in error_str
-        )
-        
-        if is_rate_limit:
+
+        if _is_rate_limit_error(e):
             print(f"\n❌ Rate Limit Error: {error_str[:300]}")
             print("\n💡 Rate Limit Solutions:")
             print("   1. Wait for the rate limit to reset (check error message for wait time)")
@@ -384,4 +1004,6 @@ if __name__ == "__main__":
                 print("   - OpenAI: https://status.openai.com")
         
         import traceback
+        # stdout is block-buffered; print the messages above before the traceback on stderr
+        sys.stdout.flush()
         traceback.print_exc()
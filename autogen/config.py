@@ -18,6 +18,7 @@ Usage:
     config_list = Config.get_config_list()
 """
 
+import os
 import sys
 from pathlib import Path
 from typing import List, Dict, Any
@@ -40,6 +41,23 @@ class Config(SharedConfig):
     HUMAN_INPUT_MODE = "NEVER"  # Agents operate autonomously
     MAX_RETRIES = 2  # Retry failed API calls
 
+    # Generate all phases in one structured-output call; falls back to one
+    # call per phase when the model does not support JSON schema output
+    SINGLE_CALL_PLAN = os.getenv("SINGLE_CALL_PLAN", "True").lower() == "true"
+
+    # Prompt caching: attach explicit cache_control markers to the shared
+    # prompt prefix (Anthropic-compatible endpoints). OpenAI and Groq cache
+    # identical prefixes automatically and need no markers.
+    PROMPT_CACHE_CONTROL = "anthropic" in SharedConfig.API_BASE.lower()
+
+    # Response cache: identical (or near-identical, by embedding similarity)
+    # prompts are answered from disk. Skipped for sampling temperatures above
+    # CACHE_MAX_TEMPERATURE, where a fresh answer is expected on every run.
+    CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "True").lower() == "true"
+    CACHE_PATH = str(Path(__file__).parent / "llm_cache.sqlite")
+    CACHE_SIMILARITY = 0.97
+    CACHE_MAX_TEMPERATURE = 0.3
+
     # Output Settings
     OUTPUT_DIR = str(Path(__file__).parent)
     SAVE_OUTPUTS = True
@@ -154,6 +172,16 @@ class WorkflowConfig:
         "review",
     ]
 
+    # Phase dependencies: phase -> phases whose outputs it consumes.
+    # Phases whose dependencies are all complete are scheduled together.
+    PHASE_DEPENDENCIES = {
+        "research": set(),
+        "analysis": {"research"},
+        "blueprint": {"analysis"},
+        "technical": {"blueprint"},
+        "review": {"blueprint", "technical"},
+    }
+
     # Phase descriptions
     PHASE_DESCRIPTIONS = {
         "research": "Market Research & Competitive Analysis",
@@ -12,34 +12,93 @@ Agents:
 4. Logistics Coordinator - Handles venue, catering, and event logistics
 5. Marketing Specialist - Creates promotional strategy and materials
 
+Task flow:
+- Phase 1 (prep crews): the strategy, then the speaker recommendations, one
+  single-task crew after the other so the speaker curator is only built once
+  the strategy has succeeded
+- Phase 2 (leaf crews): the agenda, logistics and marketing each get their own
+  crew and run concurrently (asyncio.gather over Crew.kickoff_async), reading
+  the phase-1 outputs through their task context
+
+With PLAN_CACHE_ENABLED, each task output is cached by the conference
+parameters; a later run with the same model and the same or a very similar
+(embedding cosine similarity >= 0.9) type, topic and audience reuses it and
+only runs the tasks that missed. A task is only reused while the parameters
+its output states are unchanged (e.g. location, dates and headcount for the
+logistics).
+
+Every completed task is appended to conference_plan_<topic>_<id>.jsonl, where
+<id> is a hash of all the conference parameters. If a run
+fails part-way, rerunning the same conference resumes after the tasks that
+finished; the checkpoint is removed once the report is saved.
+
+With --batch, the task prompts are sent through the provider Batch API (about
+50% cheaper, results may take minutes to hours) instead of running the crews:
+one batch job per wave of tasks whose context is complete.
+
 Configuration:
 - Uses shared configuration from the root .env file
 """
 
+import asyncio
+import importlib
+import json
+import logging
 import os
 import sys
+import threading
+from functools import lru_cache
 from pathlib import Path
+from string import Template
+from types import MappingProxyType
 from datetime import datetime
-from crewai import Agent, Task, Crew
-from crewai.tools import tool
 
 # Add parent directory to path to import shared_config
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 # Import shared configuration
 from shared_config import Config, validate_config
+from semantic_cache import SemanticCache, local_embedder
+
+log = logging.getLogger(__name__)
+
+
+def _configure_logging():
+    """Send this module's progress messages to stdout (no-op if logging is already configured)."""
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
 
 
 # ============================================================================
-# TOOLS
+# LAZY IMPORTS
 # ============================================================================
+# Importing CrewAI pulls in LiteLLM, tiktoken and many pydantic models, which
+# dominates start-up time. It is imported on first use instead of at module
+# import, so e.g. importing this module to reuse the prompt builders is cheap.
 
-@tool
-def research_conference_trends(topic: str) -> str:
-    """
-    Research current trends and best practices for conference planning in a specific topic area.
-    """
-    return f"""
+@lru_cache(maxsize=None)
+def _crewai():
+    """Import and cache the crewai package."""
+    return importlib.import_module("crewai")
+
+
+@lru_cache(maxsize=None)
+def _as_tool(func):
+    """Wrap a plain function as a CrewAI tool (once per function)."""
+    return importlib.import_module("crewai.tools").tool(func)
+
+
+# ============================================================================
+# TOOLS
+# ============================================================================
+# The tools below only build research prompts in memory; they do no I/O, so they
+# are kept synchronous. CrewAI runs a step's tool calls one after another, and
+# an async tool would only add an event loop round-trip per call. Tools that
+# start making network calls should offload the blocking work with
+# loop.run_in_executor() rather than block the agent's thread.
+# They are plain functions, wrapped as CrewAI tools by _as_tool() when an agent
+# is created.
+
+_TRENDS_TEMPLATE = sys.intern("""
     Research task: Find current trends and best practices for {topic} conferences.
 
     Please research and provide:
@@ -52,15 +111,17 @@ def research_conference_trends(topic: str) -> str:
     7. Expected attendee preferences and expectations
 
     Focus on modern, engaging conference formats that maximize value for attendees.
-    """
+    """)
 
 
-@tool
-def identify_speakers(topic: str, conference_type: str) -> str:
+def research_conference_trends(topic: str) -> str:
     """
-    Identify potential speakers and experts for a conference topic.
+    Research current trends and best practices for conference planning in a specific topic area.
     """
-    return f"""
+    return _TRENDS_TEMPLATE.format(topic=topic)
+
+
+_SPEAKERS_TEMPLATE = sys.intern("""
     Research task: Identify potential speakers for a {conference_type} conference on {topic}.
 
     Please research and provide:
@@ -74,15 +135,17 @@ def identify_speakers(topic: str, conference_type: str) -> str:
 
     Include a mix of established experts and emerging voices.
     Focus on speakers who can provide valuable insights for the target audience.
-    """
+    """)
 
 
-@tool
-def research_venue_options(location: str, capacity: int) -> str:
+def identify_speakers(topic: str, conference_type: str) -> str:
     """
-    Research venue options for hosting a conference.
+    Identify potential speakers and experts for a conference topic.
     """
-    return f"""
+    return _SPEAKERS_TEMPLATE.format(topic=topic, conference_type=conference_type)
+
+
+_VENUE_TEMPLATE = sys.intern("""
     Research task: Find suitable venues for a conference in {location} with capacity for {capacity} attendees.
 
     Please research and provide:
@@ -96,15 +159,17 @@ def research_venue_options(location: str, capacity: int) -> str:
     8. Capacity and room configurations
 
     Include options for different budget levels and event styles.
-    """
+    """)
 
 
-@tool
-def research_marketing_channels(conference_type: str, target_audience: str) -> str:
+def research_venue_options(location: str, capacity: int) -> str:
     """
-    Research effective marketing channels and strategies for promoting a conference.
+    Research venue options for hosting a conference.
     """
-    return f"""
+    return _VENUE_TEMPLATE.format(location=location, capacity=capacity)
+
+
+_MARKETING_TEMPLATE = sys.intern("""
     Research task: Find effective marketing channels for promoting a {conference_type} conference to {target_audience}.
 
     Please research and provide:
@@ -118,105 +183,196 @@ def research_marketing_channels(conference_type: str, target_audience: str) -> s
     8. Event listing platforms
 
     Focus on channels that effectively reach the target audience.
+    """)
+
+
+def research_marketing_channels(conference_type: str, target_audience: str) -> str:
     """
+    Research effective marketing channels and strategies for promoting a conference.
+    """
+    return _MARKETING_TEMPLATE.format(conference_type=conference_type, target_audience=target_audience)
 
 
 # ============================================================================
-# AGENT DEFINITIONS
+# LLM
 # ============================================================================
 
-def create_strategist_agent(conference_topic: str):
+@lru_cache(maxsize=None)
+def planner_llm():
+    """
+    The LLM shared by every agent: the configured endpoint, retried and then
+    failed over to Config.FALLBACK_ENDPOINTS (via LiteLLM) when it errors or
+    times out.
+    """
+    fallbacks = [
+        {"model": f"openai/{endpoint['model']}", "api_base": endpoint["api_base"],
+         "api_key": endpoint.get("api_key", "")}
+        for endpoint in Config.FALLBACK_ENDPOINTS
+    ]
+    return _crewai().LLM(
+        model=f"openai/{Config.OPENAI_MODEL}",  # LiteLLM's name for any OpenAI-compatible endpoint
+        base_url=Config.API_BASE,
+        api_key=Config.API_KEY,
+        timeout=Config.AGENT_TIMEOUT,
+        num_retries=3,
+        fallbacks=fallbacks or None,
+    )
+
+
+# ============================================================================
+# AGENT DEFINITIONS
+# ============================================================================
+# CrewAI agents are mutable (a kickoff binds agent.crew, its RPM controller and
+# a fresh executor), so every plan builds its own; sharing one between
+# concurrent plans would race. What they are built from is immutable and
+# shared: the interned text below, the tool wrappers and the LLM.
+# Within a plan, an agent is only created when its task is dispatched (see
+# build_plan_tasks), so tasks that fail earlier or are served from the plan
+# cache or a checkpoint never build theirs.
+
+# Agent text is invariant and built once at import; the conference itself only
+# appears in each task's CONTEXT block. CrewAI sends role, goal and backstory
+# as the system message ahead of the task, so with nothing conference-specific
+# in them that message stays inside the prefix shared by every conference.
+# The text is interned so every crew shares one copy.
+_STRATEGIST_ROLE = "Conference Strategist"
+_STRATEGIST_GOAL = sys.intern(
+    "Define a comprehensive conference strategy, including theme, goals, target audience, "
+    "and overall vision that will guide all planning decisions."
+)
+_STRATEGIST_BACKSTORY = sys.intern(
+    "You are an experienced conference strategist with over 10 years of planning "
+    "successful industry events. You have a deep understanding of what makes conferences "
+    "engaging and valuable for attendees. You excel at identifying market needs, "
+    "defining clear objectives, and creating compelling conference themes that attract "
+    "the right audience. Your strategic thinking ensures every aspect of the conference "
+    "aligns with the overall goals and delivers maximum value to participants."
+)
+
+_SPEAKER_CURATOR_ROLE = "Speaker Curator"
+_SPEAKER_CURATOR_GOAL = sys.intern(
+    "Identify and recommend the best speakers, presenters, and experts for the conference, "
+    "ensuring diverse perspectives and high-quality content."
+)
+_SPEAKER_CURATOR_BACKSTORY = sys.intern(
+    "You are a renowned speaker curator with extensive networks in various industries. "
+    "You have a keen eye for identifying engaging speakers who can deliver valuable insights "
+    "and memorable presentations. You understand the importance of speaker diversity, "
+    "both in terms of expertise and representation. You excel at matching speakers to "
+    "session topics and ensuring a balanced program that covers all important aspects "
+    "of the conference theme. Your recommendations are always based on speaker quality, "
+    "relevance, and ability to connect with audiences."
+)
+
+_AGENDA_ARCHITECT_ROLE = "Agenda Architect"
+_AGENDA_ARCHITECT_GOAL = sys.intern(
+    "Design a detailed conference agenda for the full duration of the event, with well-structured "
+    "sessions, appropriate timing, and engaging activities that maximize learning and networking."
+)
+_AGENDA_ARCHITECT_BACKSTORY = sys.intern(
+    "You are a master agenda architect with expertise in creating conference schedules "
+    "that balance learning, networking, and engagement. You understand the importance "
+    "of pacing, breaks, and variety in keeping attendees energized throughout the event. "
+    "You excel at designing session flows that build on each other, creating logical "
+    "progressions from foundational topics to advanced discussions. You know how to "
+    "balance different session formats (keynotes, workshops, panels, networking) "
+    "and ensure there's something valuable for every attendee. Your agendas are always "
+    "practical, realistic, and optimized for maximum attendee satisfaction."
+)
+
+_LOGISTICS_COORDINATOR_ROLE = "Logistics Coordinator"
+_LOGISTICS_COORDINATOR_GOAL = sys.intern(
+    "Plan all logistical aspects of the conference in its host city, including venue selection, "
+    "catering, accommodations, and operational details to ensure smooth execution."
+)
+_LOGISTICS_COORDINATOR_BACKSTORY = sys.intern(
+    "You are a detail-oriented logistics coordinator with years of experience managing "
+    "complex events. You excel at coordinating multiple vendors, managing timelines, "
+    "and ensuring every operational detail is handled perfectly. You understand the "
+    "importance of venue selection, catering quality, and attendee comfort. You're "
+    "skilled at negotiating contracts, managing budgets, and creating contingency "
+    "plans. Your meticulous planning ensures that attendees can focus on learning and "
+    "networking without worrying about logistics. You always think ahead and anticipate "
+    "potential issues before they arise."
+)
+
+_MARKETING_SPECIALIST_ROLE = "Marketing Specialist"
+_MARKETING_SPECIALIST_GOAL = sys.intern(
+    "Develop a comprehensive marketing strategy to promote the conference and attract the "
+    "target audience, maximizing attendance and engagement."
+)
+_MARKETING_SPECIALIST_BACKSTORY = sys.intern(
+    "You are a creative marketing specialist with a proven track record of promoting "
+    "successful conferences and events. You understand how to create compelling messaging "
+    "that resonates with target audiences and drives registrations. You excel at "
+    "identifying the right marketing channels, crafting engaging content, and building "
+    "anticipation for events. You know how to leverage social media, email marketing, "
+    "partnerships, and content marketing to reach potential attendees. Your strategies "
+    "are always data-driven and focused on maximizing ROI while building a strong "
+    "conference brand and community."
+)
+
+
+def create_strategist_agent():
     """Create the Conference Strategist agent."""
-    return Agent(
-        role="Conference Strategist",
-        goal=f"Define a comprehensive conference strategy for {conference_topic}, including theme, "
-             f"goals, target audience, and overall vision that will guide all planning decisions.",
-        backstory="You are an experienced conference strategist with over 10 years of planning "
-                  "successful industry events. You have a deep understanding of what makes conferences "
-                  "engaging and valuable for attendees. You excel at identifying market needs, "
-                  "defining clear objectives, and creating compelling conference themes that attract "
-                  "the right audience. Your strategic thinking ensures every aspect of the conference "
-                  "aligns with the overall goals and delivers maximum value to participants.",
-        tools=[research_conference_trends],
+    return _crewai().Agent(
+        role=_STRATEGIST_ROLE,
+        goal=_STRATEGIST_GOAL,
+        backstory=_STRATEGIST_BACKSTORY,
+        tools=[_as_tool(research_conference_trends)],
+        llm=planner_llm(),
         verbose=True,
         allow_delegation=False
     )
 
 
-def create_speaker_curator_agent(conference_topic: str):
+def create_speaker_curator_agent():
     """Create the Speaker Curator agent."""
-    return Agent(
-        role="Speaker Curator",
-        goal=f"Identify and recommend the best speakers, presenters, and experts for the {conference_topic} "
-             f"conference, ensuring diverse perspectives and high-quality content.",
-        backstory="You are a renowned speaker curator with extensive networks in various industries. "
-                  "You have a keen eye for identifying engaging speakers who can deliver valuable insights "
-                  "and memorable presentations. You understand the importance of speaker diversity, "
-                  "both in terms of expertise and representation. You excel at matching speakers to "
-                  "session topics and ensuring a balanced program that covers all important aspects "
-                  "of the conference theme. Your recommendations are always based on speaker quality, "
-                  "relevance, and ability to connect with audiences.",
-        tools=[identify_speakers],
+    return _crewai().Agent(
+        role=_SPEAKER_CURATOR_ROLE,
+        goal=_SPEAKER_CURATOR_GOAL,
+        backstory=_SPEAKER_CURATOR_BACKSTORY,
+        tools=[_as_tool(identify_speakers)],
+        llm=planner_llm(),
         verbose=True,
         allow_delegation=False
     )
 
 
-def create_agenda_architect_agent(conference_topic: str, duration: str):
+def create_agenda_architect_agent():
     """Create the Agenda Architect agent."""
-    return Agent(
-        role="Agenda Architect",
-        goal=f"Design a detailed {duration} conference agenda with well-structured sessions, "
-             f"appropriate timing, and engaging activities that maximize learning and networking.",
-        backstory="You are a master agenda architect with expertise in creating conference schedules "
-                  "that balance learning, networking, and engagement. You understand the importance "
-                  "of pacing, breaks, and variety in keeping attendees energized throughout the event. "
-                  "You excel at designing session flows that build on each other, creating logical "
-                  "progressions from foundational topics to advanced discussions. You know how to "
-                  "balance different session formats (keynotes, workshops, panels, networking) "
-                  "and ensure there's something valuable for every attendee. Your agendas are always "
-                  "practical, realistic, and optimized for maximum attendee satisfaction.",
+    return _crewai().Agent(
+        role=_AGENDA_ARCHITECT_ROLE,
+        goal=_AGENDA_ARCHITECT_GOAL,
+        backstory=_AGENDA_ARCHITECT_BACKSTORY,
         tools=[],
+        llm=planner_llm(),
         verbose=True,
         allow_delegation=False
     )
 
 
-def create_logistics_coordinator_agent(location: str):
+def create_logistics_coordinator_agent():
     """Create the Logistics Coordinator agent."""
-    return Agent(
-        role="Logistics Coordinator",
-        goal=f"Plan all logistical aspects of the conference in {location}, including venue selection, "
-             f"catering, accommodations, and operational details to ensure smooth execution.",
-        backstory="You are a detail-oriented logistics coordinator with years of experience managing "
-                  "complex events. You excel at coordinating multiple vendors, managing timelines, "
-                  "and ensuring every operational detail is handled perfectly. You understand the "
-                  "importance of venue selection, catering quality, and attendee comfort. You're "
-                  "skilled at negotiating contracts, managing budgets, and creating contingency "
-                  "plans. Your meticulous planning ensures that attendees can focus on learning and "
-                  "networking without worrying about logistics. You always think ahead and anticipate "
-                  "potential issues before they arise.",
-        tools=[research_venue_options],
+    return _crewai().Agent(
+        role=_LOGISTICS_COORDINATOR_ROLE,
+        goal=_LOGISTICS_COORDINATOR_GOAL,
+        backstory=_LOGISTICS_COORDINATOR_BACKSTORY,
+        tools=[_as_tool(research_venue_options)],
+        llm=planner_llm(),
         verbose=True,
         allow_delegation=False
     )
 
 
-def create_marketing_specialist_agent(conference_topic: str):
+def create_marketing_specialist_agent():
     """Create the Marketing Specialist agent."""
-    return Agent(
-        role="Marketing Specialist",
-        goal=f"Develop a comprehensive marketing strategy to promote the {conference_topic} conference "
-             f"and attract the target audience, maximizing attendance and engagement.",
-        backstory="You are a creative marketing specialist with a proven track record of promoting "
-                  "successful conferences and events. You understand how to create compelling messaging "
-                  "that resonates with target audiences and drives registrations. You excel at "
-                  "identifying the right marketing channels, crafting engaging content, and building "
-                  "anticipation for events. You know how to leverage social media, email marketing, "
-                  "partnerships, and content marketing to reach potential attendees. Your strategies "
-                  "are always data-driven and focused on maximizing ROI while building a strong "
-                  "conference brand and community.",
-        tools=[research_marketing_channels],
+    return _crewai().Agent(
+        role=_MARKETING_SPECIALIST_ROLE,
+        goal=_MARKETING_SPECIALIST_GOAL,
+        backstory=_MARKETING_SPECIALIST_BACKSTORY,
+        tools=[_as_tool(research_marketing_channels)],
+        llm=planner_llm(),
         verbose=True,
         allow_delegation=False
     )
@@ -225,92 +381,747 @@ def create_marketing_specialist_agent(conference_topic: str):
 # ============================================================================
 # TASK DEFINITIONS
 # ============================================================================
+# Task descriptions start with invariant instructions and end with a CONTEXT
+# block holding the conference parameters. The instructions are byte-identical
+# on every run, so providers with automatic prompt caching can serve them from
+# the prefix cache; only the short CONTEXT block differs between conferences.
+# Downstream tasks receive the strategy (and other upstream outputs) through
+# Task(context=[...]), so their CONTEXT blocks carry only the parameters the
+# strategy does not already cover, such as dates and capacity.
+# Descriptions are precompiled string.Template objects ("$" placeholders also
+# stay clear of CrewAI's own {input} interpolation). Expected outputs only list
+# the required sections; the conference itself is already in the description.
+
+_STRATEGY_INSTRUCTIONS = sys.intern(
+    "Develop a comprehensive conference strategy for the conference described in the CONTEXT "
+    "below, aimed at its target audience. Define the conference theme, core objectives, target "
+    "audience profile, key topics to cover, and overall vision. Research current trends in "
+    "conference planning and ensure the strategy aligns with industry best practices. Create a "
+    "clear foundation that will guide all subsequent planning decisions."
+)
+
+_SPEAKER_INSTRUCTIONS = sys.intern(
+    "Based on the conference strategy, identify and recommend speakers for the conference, with "
+    "the conference type given in the CONTEXT below. Research potential keynote speakers, session presenters, workshop "
+    "facilitators, and panel participants. Ensure diversity in expertise, perspectives, and "
+    "representation. For each recommended speaker, provide their credentials, relevant experience, "
+    "and suggested topics they could present on."
+)
+
+_AGENDA_INSTRUCTIONS = sys.intern(
+    "Create a detailed conference agenda covering the duration and dates given in the CONTEXT "
+    "below. Based on the conference strategy and speaker recommendations, "
+    "design a day-by-day schedule that includes: opening and closing keynotes, breakout sessions, "
+    "workshops, panel discussions, networking breaks, lunch periods, and social events. Ensure "
+    "appropriate timing for each session, logical flow of topics, and variety in session formats. "
+    "Include session titles, descriptions, speakers, and time slots. Make the agenda engaging and "
+    "well-paced."
+)
+
+_LOGISTICS_INSTRUCTIONS = sys.intern(
+    "Plan all logistical aspects for the conference described in the CONTEXT below. Research and "
+    "recommend venue options at its location that can accommodate the expected attendance, "
+    "including considerations for main sessions, breakout rooms, and networking spaces. Plan "
+    "catering options (coffee breaks, lunch, reception), accommodation recommendations for "
+    "out-of-town attendees, transportation options, and any special requirements. Provide "
+    "practical recommendations with cost considerations."
+)
+
+_MARKETING_INSTRUCTIONS = sys.intern(
+    "Develop a comprehensive marketing strategy to promote the conference to the target audience "
+    "defined in the conference strategy, ahead of the dates given in the CONTEXT below. Research effective marketing channels and create a multi-channel "
+    "strategy including social media campaigns, email marketing, content marketing, partnerships, "
+    "and event listings. Develop key messaging, promotional timeline, early bird pricing strategy, "
+    "and engagement tactics. Create a plan that builds anticipation and drives registrations while "
+    "building a community around the conference."
+)
+
+_CONTEXT_HEADER = "\n\nCONTEXT:\n"
+
+_STRATEGY_DESCRIPTION = Template(_STRATEGY_INSTRUCTIONS + _CONTEXT_HEADER + "topic: $topic\naudience: $audience")
+_STRATEGY_EXPECTED = "Conference strategy: theme, objectives, audience profile, key topics, strategic vision"
+
+_SPEAKER_DESCRIPTION = Template(_SPEAKER_INSTRUCTIONS + _CONTEXT_HEADER + "type: $type")
+_SPEAKER_EXPECTED = "Speaker list: keynotes, presenters, panelists; credentials, suggested topics"
+
+_AGENDA_DESCRIPTION = Template(
+    _AGENDA_INSTRUCTIONS + _CONTEXT_HEADER + "duration: $duration\ndates: $dates"
+)
+_AGENDA_EXPECTED = "Day-by-day agenda: sessions, speakers, times, descriptions"
+
+_LOGISTICS_DESCRIPTION = Template(
+    _LOGISTICS_INSTRUCTIONS + _CONTEXT_HEADER
+    + "location: $location\ndates: $dates\nexpected_attendees: $expected_attendees"
+)
+_LOGISTICS_EXPECTED = "Logistics plan: venues, catering, accommodation, operational details"
+
+_MARKETING_DESCRIPTION = Template(_MARKETING_INSTRUCTIONS + _CONTEXT_HEADER + "dates: $dates")
+_MARKETING_EXPECTED = "Marketing strategy: channels, messaging, timeline, pricing, engagement tactics"
+
 
 def create_strategy_task(strategist_agent, conference_topic: str, target_audience: str):
     """Define the conference strategy task."""
-    return Task(
-        description=f"Develop a comprehensive conference strategy for {conference_topic} targeting {target_audience}. "
-                   f"Define the conference theme, core objectives, target audience profile, key topics to cover, "
-                   f"and overall vision. Research current trends in conference planning and ensure the strategy "
-                   f"aligns with industry best practices. Create a clear foundation that will guide all "
-                   f"subsequent planning decisions.",
+    return _crewai().Task(
+        description=_STRATEGY_DESCRIPTION.substitute(topic=conference_topic, audience=target_audience),
         agent=strategist_agent,
-        expected_output=f"A detailed conference strategy document for {conference_topic} including theme, "
-                       f"objectives, target audience analysis, key topics, and strategic vision"
+        expected_output=_STRATEGY_EXPECTED
     )
 
 
-def create_speaker_task(speaker_curator_agent, conference_topic: str, conference_type: str):
-    """Define the speaker curation task."""
-    return Task(
-        description=f"Based on the conference strategy, identify and recommend speakers for the {conference_topic} "
-                   f"{conference_type} conference. Research potential keynote speakers, session presenters, "
-                   f"workshop facilitators, and panel participants. Ensure diversity in expertise, perspectives, "
-                   f"and representation. For each recommended speaker, provide their credentials, relevant "
-                   f"experience, and suggested topics they could present on.",
+def create_speaker_task(speaker_curator_agent, conference_type: str, context: list):
+    """Define the speaker curation task (phase 1, after the strategy)."""
+    return _crewai().Task(
+        description=_SPEAKER_DESCRIPTION.substitute(type=conference_type),
         agent=speaker_curator_agent,
-        expected_output=f"A curated list of recommended speakers for {conference_topic} including keynote "
-                       f"speakers, session presenters, and panel participants with their credentials and "
-                       f"suggested topics"
+        context=context,
+        expected_output=_SPEAKER_EXPECTED
     )
 
 
-def create_agenda_task(agenda_architect_agent, conference_topic: str, duration: str, conference_dates: str):
-    """Define the agenda creation task."""
-    return Task(
-        description=f"Create a detailed {duration} conference agenda for {conference_topic} ({conference_dates}). "
-                   f"Based on the conference strategy and speaker recommendations, design a day-by-day schedule "
-                   f"that includes: opening and closing keynotes, breakout sessions, workshops, panel discussions, "
-                   f"networking breaks, lunch periods, and social events. Ensure appropriate timing for each session, "
-                   f"logical flow of topics, and variety in session formats. Include session titles, descriptions, "
-                   f"speakers, and time slots. Make the agenda engaging and well-paced.",
+def create_agenda_task(agenda_architect_agent, duration: str, conference_dates: str, context: list):
+    """Define the agenda creation task (phase 2, uses the strategy and speakers)."""
+    return _crewai().Task(
+        description=_AGENDA_DESCRIPTION.substitute(duration=duration, dates=conference_dates),
         agent=agenda_architect_agent,
-        expected_output=f"A comprehensive {duration} conference agenda for {conference_topic} with detailed "
-                       f"day-by-day schedule including all sessions, speakers, times, and descriptions"
+        context=context,
+        expected_output=_AGENDA_EXPECTED
     )
 
 
-def create_logistics_task(logistics_coordinator_agent, location: str, expected_attendees: int, conference_dates: str):
-    """Define the logistics planning task."""
-    return Task(
-        description=f"Plan all logistical aspects for the conference in {location} ({conference_dates}) with "
-                   f"an expected attendance of {expected_attendees} people. Research and recommend venue options "
-                   f"that can accommodate the event, including considerations for main sessions, breakout rooms, "
-                   f"and networking spaces. Plan catering options (coffee breaks, lunch, reception), "
-                   f"accommodation recommendations for out-of-town attendees, transportation options, "
-                   f"and any special requirements. Provide practical recommendations with cost considerations.",
+def create_logistics_task(logistics_coordinator_agent, location: str, expected_attendees: int, conference_dates: str,
+                          context: list):
+    """Define the logistics planning task (phase 2, runs concurrently with the agenda and marketing)."""
+    return _crewai().Task(
+        description=_LOGISTICS_DESCRIPTION.substitute(location=location, dates=conference_dates,
+                                                      expected_attendees=expected_attendees),
         agent=logistics_coordinator_agent,
-        expected_output=f"A comprehensive logistics plan for the conference in {location} including venue "
-                       f"recommendations, catering options, accommodation suggestions, and operational details"
+        context=context,
+        expected_output=_LOGISTICS_EXPECTED
     )
 
 
-def create_marketing_task(marketing_specialist_agent, conference_topic: str, target_audience: str, conference_dates: str):
-    """Define the marketing strategy task."""
-    return Task(
-        description=f"Develop a comprehensive marketing strategy to promote the {conference_topic} conference "
-                   f"({conference_dates}) to {target_audience}. Research effective marketing channels and create "
-                   f"a multi-channel strategy including social media campaigns, email marketing, content marketing, "
-                   f"partnerships, and event listings. Develop key messaging, promotional timeline, early bird "
-                   f"pricing strategy, and engagement tactics. Create a plan that builds anticipation and drives "
-                   f"registrations while building a community around the conference.",
+def create_marketing_task(marketing_specialist_agent, conference_dates: str, context: list):
+    """Define the marketing strategy task (phase 2, runs concurrently with the agenda and logistics)."""
+    return _crewai().Task(
+        description=_MARKETING_DESCRIPTION.substitute(dates=conference_dates),
         agent=marketing_specialist_agent,
-        expected_output=f"A detailed marketing strategy for {conference_topic} including marketing channels, "
-                       f"messaging, promotional timeline, pricing strategy, and engagement tactics"
+        context=context,
+        expected_output=_MARKETING_EXPECTED
+    )
+
+
+# ============================================================================
+# PLAN CACHE
+# ============================================================================
+# Task outputs are stored next to the generated plans, one entry per task and
+# set of conference parameters. The descriptive parameters every task builds
+# on (type, topic, audience) are embedded for the similarity lookup. The task,
+# the model and the exact values a task's output states, its own and its
+# upstream tasks', form its scope, so e.g. a similar conference in another city
+# is never served the other city's venues.
+
+_PLAN_CACHE_PATH = Path(__file__).parent / "plan_cache.sqlite"
+_PLAN_CACHE_SIMILARITY = 0.9
+_EMBEDDING_MODEL = "text-embedding-3-small"
+
+
+def _api_embedder(text: str) -> list:
+    """Embed text with the configured OpenAI-compatible /embeddings endpoint."""
+    import httpx
+
+    response = httpx.post(
+        f"{Config.API_BASE}/embeddings",
+        headers={"Authorization": f"Bearer {Config.API_KEY}"},
+        json={"model": _EMBEDDING_MODEL, "input": text},
+        timeout=30,
     )
+    response.raise_for_status()
+    return response.json()["data"][0]["embedding"]
+
+
+def open_plan_cache():
+    """
+    Open the plan cache, or return None when PLAN_CACHE_ENABLED is off.
+
+    Groq has no embeddings endpoint, so a local sentence-transformers model is
+    used there when installed (otherwise only exact matches are served).
+    """
+    if not Config.PLAN_CACHE_ENABLED:
+        return None
+    embed = local_embedder() if Config.USE_GROQ else _api_embedder
+    return SemanticCache(_PLAN_CACHE_PATH, threshold=_PLAN_CACHE_SIMILARITY, embed=embed)
+
+
+# Parameters each task's output states verbatim, including through its context
+_PLAN_CACHE_SCOPES = {
+    "strategy": (),
+    "speakers": (),
+    "agenda": ("duration", "conference_dates"),
+    "logistics": ("location", "conference_dates", "expected_attendees"),
+    "marketing": ("conference_dates",),
+}
+
+
+def _plan_cache_entry(task_name: str, inputs: dict):
+    """Exact-match key, similarity scope and similarity text of one task's output for a set of inputs."""
+    key = SemanticCache.make_key("conference_plan", task_name, Config.OPENAI_MODEL,
+                                 *(f"{name}={inputs[name]}" for name in sorted(inputs)))
+    scope = SemanticCache.make_key("conference_plan", task_name, Config.OPENAI_MODEL,
+                                   *(f"{name}={inputs[name]}" for name in _PLAN_CACHE_SCOPES[task_name]))
+    # The same text for every task, so the cache embeds it once per plan
+    text = (f"{inputs['conference_type']} conference on {inputs['conference_topic']} "
+            f"for {inputs['target_audience']}")
+    return key, scope, text
+
+
+def load_cached_outputs(cache, named_tasks: dict, inputs: dict) -> list:
+    """
+    Fill in the outputs of tasks already in the plan cache.
+
+    A task with an output is skipped by run_planning(); its output still
+    reaches downstream tasks through their context. Tasks that already have
+    an output (resumed from this conference's checkpoint) are left as they are.
+
+    Returns:
+        list: Names of the tasks served from the cache
+    """
+    TaskOutput = importlib.import_module("crewai.tasks.task_output").TaskOutput
+
+    hits = []
+    for name, task in named_tasks.items():
+        if task.output is not None:
+            continue
+        key, scope, text = _plan_cache_entry(name, inputs)
+        try:
+            raw = cache.get(key, text, scope)
+        except Exception as e:  # The embeddings endpoint is optional; treat errors as a miss
+            log.warning("⚠️  Plan cache lookup failed for %s: %s", name, e)
+            continue
+        if raw is not None:
+            task.output = TaskOutput(description=task.description, raw=raw, agent=_TASK_ROLES[name])
+            hits.append(name)
+    return hits
+
+
+def store_outputs(cache, named_tasks: dict, inputs: dict):
+    """Save the output of every completed task to the plan cache."""
+    for name, task in named_tasks.items():
+        if task.output is None:
+            continue
+        key, scope, text = _plan_cache_entry(name, inputs)
+        try:
+            cache.put(key, text, task.output.raw, scope)
+        except Exception as e:
+            log.warning("⚠️  Could not cache %s output: %s", name, e)
+
+
+# ============================================================================
+# CHECKPOINTS
+# ============================================================================
+# Each task appends its output to a JSONL file as soon as it completes (from
+# CrewAI's worker threads, hence the lock). A record only resumes a task while
+# the task's prompt, the model and every conference parameter are unchanged:
+# downstream prompts do not repeat every parameter (e.g. the audience), but
+# their output depends on it through the strategy.
+
+_checkpoint_lock = threading.Lock()
+
+
+def _checkpoint_path(inputs: dict) -> Path:
+    """Checkpoint file of a conference, next to its report."""
+    return _output_path(inputs).with_suffix(".jsonl")
+
+
+def _checkpoint_key(task, inputs: dict) -> str:
+    """Identify a task's prompt and inputs, so edited prompts or parameters are not resumed from stale output."""
+    return SemanticCache.make_key(Config.OPENAI_MODEL, task.description, task.expected_output,
+                                  *(f"{name}={inputs[name]}" for name in sorted(inputs)))
+
+
+def _append_jsonl(path: Path, record: dict):
+    """Append one record and force it to disk."""
+    with _checkpoint_lock, open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def attach_checkpoints(path: Path, named_tasks: dict, inputs: dict):
+    """Make every task append its output to the checkpoint file when it completes."""
+    for name, task in named_tasks.items():
+        key = _checkpoint_key(task, inputs)
+        task.callback = lambda output, name=name, key=key: _append_jsonl(
+            path, {"task": name, "key": key, "result": output.raw})
+
+
+def load_checkpoint(path: Path, named_tasks: dict, inputs: dict) -> list:
+    """
+    Fill in the outputs of tasks completed by an earlier, interrupted run.
+
+    Returns:
+        list: Names of the tasks resumed from the checkpoint
+    """
+    if not path.exists():
+        return []
+    TaskOutput = importlib.import_module("crewai.tasks.task_output").TaskOutput
+
+    resumed = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Partial line left by a crash mid-write
+            name = record.get("task")
+            task = named_tasks.get(name)
+            if task is None or task.output is not None or record.get("key") != _checkpoint_key(task, inputs):
+                continue
+            task.output = TaskOutput(description=task.description, raw=record["result"], agent=_TASK_ROLES[name])
+            resumed.append(record["task"])
+    return resumed
 
 
 # ============================================================================
 # CREW ORCHESTRATION
 # ============================================================================
 
+def _build_crew(tasks: list, max_rpm):
+    """Form a sequential crew from tasks and their agents."""
+    return _crewai().Crew(
+        agents=[task.agent for task in tasks],
+        tasks=tasks,
+        verbose=True,
+        process="sequential",
+        max_rpm=max_rpm
+    )
+
+
+def _dispatch(named_tasks: dict, agent_thunks: dict, names) -> list:
+    """Attach its agent to every named task that still has to run, and return those tasks."""
+    pending = []
+    for name in names:
+        task = named_tasks[name]
+        if task.output is None:
+            if task.agent is None:
+                task.agent = agent_thunks[name]()
+            pending.append(task)
+    return pending
+
+
+async def run_planning(named_tasks: dict, agent_thunks: dict, inputs: dict,
+                       max_rpm: int = Config.MAX_RPM) -> tuple:
+    """
+    Run the prep tasks one crew after the other, then each leaf task in its own crew, concurrently.
+
+    Each task reads its upstream outputs through its context, so a prep task
+    only starts once the previous one has finished, and the leaf tasks once all
+    prep tasks have. Tasks that already have an output (e.g.
+    from the plan cache) are left out of their crew; a crew with nothing left
+    to do is not started. Agents are created as their crew is formed.
+
+    Args:
+        named_tasks: Task name to Task, from build_plan_tasks()
+        agent_thunks: Task name to a callable creating the task's agent
+        inputs: Kickoff inputs
+        max_rpm: Request budget of this plan (None = no cap)
+
+    Returns:
+        tuple: (TaskOutput of every task, in task flow order;
+        token usage summed over the crews that ran)
+    """
+    leaf_names = [name for name in named_tasks if name not in _PREP_TASKS]
+    # The concurrent leaf crews share the request budget
+    leaf_rpm = max(1, max_rpm // len(leaf_names)) if max_rpm else None
+
+    usage = {"prompt_tokens": 0, "cached_prompt_tokens": 0}
+
+    async def kickoff(tasks, max_rpm):
+        crew = _build_crew(tasks, max_rpm)
+        result = await crew.kickoff_async(inputs=inputs)
+        for field in usage:
+            usage[field] += getattr(result.token_usage, field, 0) or 0
+
+    # One crew per prep task, so a failed strategy never builds the speaker curator
+    for name in _PREP_TASKS:
+        prep_pending = _dispatch(named_tasks, agent_thunks, [name])
+        if prep_pending:
+            await kickoff(prep_pending, max_rpm)
+    await asyncio.gather(*(
+        kickoff([task], leaf_rpm) for task in _dispatch(named_tasks, agent_thunks, leaf_names)
+    ))
+    return [task.output for task in named_tasks.values()], usage
+
+
+# ============================================================================
+# BATCH MODE
+# ============================================================================
+# For scheduled, non-interactive runs. Each task is answered by one chat
+# completion (no tool calls), with the same role-playing system prompt and
+# context layout CrewAI uses.
+
+_BATCH_POLL_INTERVAL = 30  # seconds
+_BATCH_TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+def _task_messages(task) -> list:
+    """Render a task as the chat messages CrewAI would send for it."""
+    agent = task.agent
+    user_prompt = task.prompt()
+    context = task.context if isinstance(task.context, list) else []
+    if context:
+        context_text = "\n\n----------\n\n".join(ctx.output.raw for ctx in context)
+        user_prompt += f"\n\nThis is the context you're working with:\n{context_text}"
+    return [
+        {"role": "system", "content": f"You are {agent.role}. {agent.backstory}\nYour personal goal is: {agent.goal}"},
+        {"role": "user", "content": user_prompt},
+    ]
+
+
+async def _run_batch(client, named_wave: dict, usage: dict):
+    """Submit one wave of tasks as a batch job, wait for it, and fill in their outputs."""
+    TaskOutput = importlib.import_module("crewai.tasks.task_output").TaskOutput
+
+    lines = [
+        json.dumps({
+            "custom_id": name,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": Config.OPENAI_MODEL,
+                "messages": _task_messages(task),
+                "temperature": Config.AGENT_TEMPERATURE,
+                "max_tokens": Config.AGENT_MAX_TOKENS,
+            },
+        })
+        for name, task in named_wave.items()
+    ]
+    batch_file = await client.files.create(
+        file=("batch.jsonl", "\n".join(lines).encode("utf-8")),
+        purpose="batch",
+    )
+    batch = await client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+    )
+    log.info("📦 Submitted batch %s for: %s; polling...", batch.id, ", ".join(named_wave))
+    while batch.status not in _BATCH_TERMINAL_STATUSES:
+        await asyncio.sleep(_BATCH_POLL_INTERVAL)
+        batch = await client.batches.retrieve(batch.id)
+    if batch.status != "completed" or not batch.output_file_id:
+        raise RuntimeError(f"Batch {batch.id} ended with status '{batch.status}'")
+
+    content = await client.files.content(batch.output_file_id)
+    for line in content.text.splitlines():
+        if not line.strip():
+            continue
+        result = json.loads(line)
+        name = result["custom_id"]
+        response = result.get("response") or {}
+        if response.get("status_code") != 200:
+            raise RuntimeError(f"Batch request {name} failed: {result.get('error') or response.get('body')}")
+        body = response["body"]
+        task = named_wave[name]
+        task.output = TaskOutput(description=task.description,
+                                 raw=body["choices"][0]["message"]["content"] or "",
+                                 agent=task.agent.role)
+        if task.callback is not None:
+            task.callback(task.output)
+        body_usage = body.get("usage") or {}
+        usage["prompt_tokens"] += body_usage.get("prompt_tokens", 0)
+        usage["cached_prompt_tokens"] += (body_usage.get("prompt_tokens_details") or {}).get("cached_tokens", 0)
+    missing = [name for name, task in named_wave.items() if task.output is None]
+    if missing:
+        raise RuntimeError(f"Batch {batch.id} returned no output for: {', '.join(missing)}")
+
+
+async def run_planning_batch(named_tasks: dict, agent_thunks: dict) -> tuple:
+    """
+    Run the tasks through the provider Batch API, one batch per wave.
+
+    A wave is every remaining task whose context tasks all have outputs, so
+    the strategy goes first, then the tasks that only need it, and so on.
+    Agents (needed for the system prompt) are created as their wave is submitted.
+
+    Returns:
+        tuple: (TaskOutput of every task, in the given order; token usage)
+    """
+    from openai import AsyncOpenAI
+
+    usage = {"prompt_tokens": 0, "cached_prompt_tokens": 0}
+    pending = {name: task for name, task in named_tasks.items() if task.output is None}
+    async with AsyncOpenAI(api_key=Config.API_KEY, base_url=Config.API_BASE) as client:
+        while pending:
+            wave = {
+                name: task for name, task in pending.items()
+                if all(ctx.output is not None for ctx in (task.context if isinstance(task.context, list) else []))
+            }
+            if not wave:
+                raise ValueError(f"Unsatisfiable task context: {sorted(pending)}")
+            _dispatch(named_tasks, agent_thunks, wave)
+            await _run_batch(client, wave, usage)
+            for name in wave:
+                del pending[name]
+    return [task.output for task in named_tasks.values()], usage
+
+
+# Default conference parameters; main_many() jobs only need the fields that differ.
+# Kickoff inputs are built once per plan as read-only mappings and shared by
+# every crew, cache lookup and report of that plan.
+DEFAULT_CONFERENCE = MappingProxyType({
+    "conference_topic": "Artificial Intelligence in Healthcare",
+    "conference_type": "professional development",
+    "target_audience": "healthcare professionals and AI researchers",
+    "location": "San Francisco, CA",
+    "conference_dates": "March 15-17, 2026",
+    "duration": "3-day",
+    "expected_attendees": 300
+})
+
+
+def configure_environment() -> bool:
+    """Validate the configuration and expose it to CrewAI through environment variables."""
+    if not validate_config():
+        return False
+
+    os.environ["OPENAI_API_KEY"] = Config.API_KEY
+    os.environ["OPENAI_API_BASE"] = Config.API_BASE
+
+    if Config.USE_GROQ:
+        os.environ["OPENAI_MODEL_NAME"] = Config.OPENAI_MODEL
+    return True
+
+
+# Prep tasks, run in this order; every other task runs in its own leaf crew
+_PREP_TASKS = ("strategy", "speakers")
+
+# Agent role of each task, known before the agent itself is created
+_TASK_ROLES = {
+    "strategy": _STRATEGIST_ROLE,
+    "speakers": _SPEAKER_CURATOR_ROLE,
+    "agenda": _AGENDA_ARCHITECT_ROLE,
+    "logistics": _LOGISTICS_COORDINATOR_ROLE,
+    "marketing": _MARKETING_SPECIALIST_ROLE,
+}
+
+
+def _agent_thunk(step: int, factory, verbose: bool = True):
+    """Defer an agent factory call until the agent's task is dispatched."""
+    def make_agent():
+        agent = factory()
+        if verbose:
+            log.info("[%d/5] Created %s Agent", step, agent.role)
+        return agent
+    return make_agent
+
+
+def build_plan_tasks(conference_topic: str, conference_type: str, target_audience: str, location: str,
+                     conference_dates: str, duration: str, expected_attendees: int,
+                     verbose: bool = True) -> tuple:
+    """
+    Create the planning tasks for one conference, and the thunks creating their agents.
+
+    The tasks are created without agents; run_planning() and
+    run_planning_batch() attach each agent when its task is dispatched.
+
+    Returns:
+        tuple: (task name to Task, in task flow order; task name to agent thunk)
+    """
+    agent_thunks = {
+        "strategy": _agent_thunk(1, create_strategist_agent, verbose=verbose),
+        "speakers": _agent_thunk(2, create_speaker_curator_agent, verbose=verbose),
+        "agenda": _agent_thunk(3, create_agenda_architect_agent, verbose=verbose),
+        "logistics": _agent_thunk(4, create_logistics_coordinator_agent, verbose=verbose),
+        "marketing": _agent_thunk(5, create_marketing_specialist_agent, verbose=verbose),
+    }
+
+    if verbose:
+        log.info("Creating tasks for the crew...")
+
+    strategy_task = create_strategy_task(None, conference_topic, target_audience)
+    speaker_task = create_speaker_task(None, conference_type, context=[strategy_task])
+    agenda_task = create_agenda_task(None, duration, conference_dates, context=[strategy_task, speaker_task])
+    logistics_task = create_logistics_task(None, location, expected_attendees, conference_dates,
+                                           context=[strategy_task])
+    marketing_task = create_marketing_task(None, conference_dates, context=[strategy_task])
+
+    if verbose:
+        log.info("Tasks created successfully!\n")
+
+    named_tasks = {
+        "strategy": strategy_task,
+        "speakers": speaker_task,
+        "agenda": agenda_task,
+        "logistics": logistics_task,
+        "marketing": marketing_task,
+    }
+    return named_tasks, agent_thunks
+
+
+async def plan_conference(inputs: dict, batch: bool = False, verbose: bool = True,
+                          max_rpm: int = Config.MAX_RPM) -> tuple:
+    """
+    Plan one conference: build its tasks, serve what the plan cache has, and run the rest.
+
+    Args:
+        inputs: Conference parameters (the keys of DEFAULT_CONFERENCE)
+        batch: Use the provider Batch API instead of running the crews
+        verbose: Print progress banners
+        max_rpm: Request budget of this plan's crews (None = no cap)
+
+    Returns:
+        tuple: (TaskOutput of every task, in task flow order; token usage)
+    """
+    named_tasks, agent_thunks = build_plan_tasks(**inputs, verbose=verbose)
+
+    checkpoint = _checkpoint_path(inputs)
+    resumed = load_checkpoint(checkpoint, named_tasks, inputs)
+    if resumed and verbose:
+        log.info("⏩ Resuming from %s: %s already done\n", checkpoint.name, ", ".join(resumed))
+    attach_checkpoints(checkpoint, named_tasks, inputs)
+
+    # The cache does blocking SQLite and embedding calls; keep them off the event loop
+    plan_cache = await asyncio.to_thread(open_plan_cache)
+    if plan_cache is not None:
+        cached = await asyncio.to_thread(load_cached_outputs, plan_cache, named_tasks, inputs)
+        if cached and verbose:
+            log.info("♻️  Reusing cached output for: %s\n", ", ".join(cached))
+
+    if verbose:
+        # Phase 1 runs its two tasks one after the other; in phase 2 every task
+        # gets its own crew so the three can run at the same time
+        log.info(
+            "Forming the Conference Planning Crews...\n"
+            "Task Flow: Strategist → Speaker Curator → (Agenda Architect | Logistics | Marketing)\n\n"
+            "%s\nStarting Crew Execution...\nPlanning %s conference: %s\n%s\n",
+            "=" * 80, inputs["duration"], inputs["conference_topic"], "=" * 80,
+        )
+
+    try:
+        if batch:
+            return await run_planning_batch(named_tasks, agent_thunks)
+        return await run_planning(named_tasks, agent_thunks, inputs, max_rpm)
+    finally:
+        # Keep whatever finished, so a rerun after a failure resumes from the cache
+        if plan_cache is not None:
+            await asyncio.to_thread(store_outputs, plan_cache, named_tasks, inputs)
+            plan_cache.close()
+
+
+def _output_path(inputs: dict) -> Path:
+    """
+    Report file of a conference, next to this module.
+
+    The name carries a hash of every parameter, so two plans for the same
+    topic (e.g. in different cities) never share a report or a checkpoint.
+    """
+    slug = inputs["conference_topic"].lower().replace(" ", "_")
+    job_id = SemanticCache.make_key(*(f"{name}={inputs[name]}" for name in sorted(inputs)))[:12]
+    return Path(__file__).parent / f"conference_plan_{slug}_{job_id}.txt"
+
+
+def _format_plan(tasks_output: list) -> str:
+    """The plan is every task's output, in task flow order."""
+    return "\n\n".join(f"## {output.agent}\n\n{output.raw}" for output in tasks_output)
+
+
+def _format_report(inputs: dict, plan: str) -> str:
+    """Render the saved report of one conference plan as a single string, ready for one write."""
+    return "".join([
+        "=" * 80 + "\n",
+        "CrewAI Multi-Agent Conference Planning System - Final Report\n",
+        f"Planning a {inputs['duration']} Conference: {inputs['conference_topic']}\n",
+        "=" * 80 + "\n\n",
+        "Conference Details:\n",
+        f"  Topic: {inputs['conference_topic']}\n",
+        f"  Type: {inputs['conference_type']}\n",
+        f"  Target Audience: {inputs['target_audience']}\n",
+        f"  Location: {inputs['location']}\n",
+        f"  Dates: {inputs['conference_dates']}\n",
+        f"  Expected Attendees: {inputs['expected_attendees']}\n\n",
+        f"Execution Time: {datetime.now()}\n",
+        f"Model: {Config.OPENAI_MODEL}\n\n",
+        "FINAL CONFERENCE PLAN:\n",
+        "-" * 80 + "\n",
+        plan,
+        "\n" + "-" * 80 + "\n",
+    ])
+
+
+async def _write_text(path: Path, text: str):
+    """Write a file without blocking the event loop (aiofiles when installed, else a worker thread)."""
+    try:
+        import aiofiles
+    except ImportError:
+        await asyncio.to_thread(path.write_text, text, encoding="utf-8")
+        return
+    async with aiofiles.open(path, "w", encoding="utf-8") as f:
+        await f.write(text)
+
+
+async def main_many(jobs: list, concurrency: int = Config.MAX_CONCURRENCY, batch: bool = False) -> list:
+    """
+    Plan several conferences concurrently.
+
+    At most `concurrency` plans are in progress at a time. Crew.kickoff_async
+    runs each crew's kickoff in a thread of the default executor, so a plan
+    holds up to three threads while its leaf crews run; the executor's size
+    (min(32, CPU count + 4) by default) therefore also caps how many crews
+    actually run at once. MAX_RPM is one budget for the whole call: it is split
+    evenly between the plans that run at once.
+
+    A failed plan does not stop the others; its entry in the result is the
+    exception it raised. Identical jobs are planned once.
+
+    Args:
+        jobs: Conference parameters per plan; missing keys fall back to DEFAULT_CONFERENCE
+        concurrency: Maximum number of plans in progress at once
+        batch: Use the provider Batch API for every plan
+
+    Returns:
+        list: Report path of every job, or the exception the job raised, in job order
+
+    Raises:
+        RuntimeError: If the configuration is invalid
+    """
+    _configure_logging()
+    if not configure_environment():
+        raise RuntimeError("Configuration validation failed. Please set up your .env file.")
+
+    frozen_jobs = [MappingProxyType({**DEFAULT_CONFERENCE, **job}) for job in jobs]
+    unique_jobs = {_output_path(inputs): inputs for inputs in frozen_jobs}
+
+    semaphore = asyncio.Semaphore(concurrency)
+    # The plans in progress share the request budget
+    running = max(1, min(concurrency, len(unique_jobs)))
+    plan_rpm = max(1, Config.MAX_RPM // running) if Config.MAX_RPM else None
+
+    async def run_one(output_path: Path, inputs: MappingProxyType) -> Path:
+        try:
+            async with semaphore:
+                tasks_output, _ = await plan_conference(inputs, batch=batch, verbose=False, max_rpm=plan_rpm)
+            await _write_text(output_path, _format_report(inputs, _format_plan(tasks_output)))
+        except Exception as e:
+            log.error("❌ %s: planning failed: %s", inputs["conference_topic"], e)
+            raise
+        _checkpoint_path(inputs).unlink(missing_ok=True)
+        log.info("✅ %s: saved to %s", inputs["conference_topic"], output_path.name)
+        return output_path
+
+    results = await asyncio.gather(*(run_one(path, inputs) for path, inputs in unique_jobs.items()),
+                                   return_exceptions=True)
+    by_path = dict(zip(unique_jobs, results))
+    return [by_path[_output_path(inputs)] for inputs in frozen_jobs]
+
+
 def main(conference_topic: str = "Artificial Intelligence in Healthcare",
          conference_type: str = "professional development",
          target_audience: str = "healthcare professionals and AI researchers",
          location: str = "San Francisco, CA",
          conference_dates: str = "March 15-17, 2026",
          duration: str = "3-day",
-         expected_attendees: int = 300):
+         expected_attendees: int = 300,
+         batch: bool = False):
     """
     Main function to orchestrate the conference planning crew.
 
@@ -322,171 +1133,87 @@ def main(conference_topic: str = "Artificial Intelligence in Healthcare",
         conference_dates: Dates of the conference
         duration: Duration (e.g., "3-day")
         expected_attendees: Expected number of attendees
+        batch: Send the task prompts through the provider Batch API instead of
+            running the crews (for scheduled, non-interactive runs)
     """
 
-    print("=" * 80)
-    print("CrewAI Multi-Agent Conference Planning System")
-    print(f"Planning a {duration} Conference: {conference_topic}")
-    print("=" * 80)
-    print()
-    print(f"📋 Topic: {conference_topic}")
-    print(f"🎯 Type: {conference_type}")
-    print(f"👥 Target Audience: {target_audience}")
-    print(f"📍 Location: {location}")
-    print(f"📅 Dates: {conference_dates}")
-    print(f"👥 Expected Attendees: {expected_attendees}")
-    print()
+    _configure_logging()
+    log.info(
+        "%s\nCrewAI Multi-Agent Conference Planning System\nPlanning a %s Conference: %s\n%s\n\n"
+        "📋 Topic: %s\n🎯 Type: %s\n👥 Target Audience: %s\n📍 Location: %s\n📅 Dates: %s\n"
+        "👥 Expected Attendees: %s\n",
+        "=" * 80, duration, conference_topic, "=" * 80,
+        conference_topic, conference_type, target_audience, location, conference_dates, expected_attendees,
+    )
 
     # Validate configuration
-    print("🔍 Validating configuration...")
-    if not validate_config():
-        print("❌ Configuration validation failed. Please set up your .env file.")
+    log.info("🔍 Validating configuration...")
+    if not configure_environment():
+        log.error("❌ Configuration validation failed. Please set up your .env file.")
         exit(1)
 
-    # Set environment variables for CrewAI
-    os.environ["OPENAI_API_KEY"] = Config.API_KEY
-    os.environ["OPENAI_API_BASE"] = Config.API_BASE
-    
-    if Config.USE_GROQ:
-        os.environ["OPENAI_MODEL_NAME"] = Config.OPENAI_MODEL
-
-    print("✅ Configuration validated successfully!")
-    print()
-    Config.print_summary()
-    print()
-
-    # Create agents
-    print("[1/5] Creating Conference Strategist Agent...")
-    strategist_agent = create_strategist_agent(conference_topic)
-
-    print("[2/5] Creating Speaker Curator Agent...")
-    speaker_curator_agent = create_speaker_curator_agent(conference_topic)
+    log.info("✅ Configuration validated successfully!\n")
+    Config.print_summary()  # Shared with AutoGen, which prints it directly
 
-    print("[3/5] Creating Agenda Architect Agent...")
-    agenda_architect_agent = create_agenda_architect_agent(conference_topic, duration)
+    inputs = MappingProxyType({
+        "conference_topic": conference_topic,
+        "conference_type": conference_type,
+        "target_audience": target_audience,
+        "location": location,
+        "conference_dates": conference_dates,
+        "duration": duration,
+        "expected_attendees": expected_attendees
+    })
 
-    print("[4/5] Creating Logistics Coordinator Agent...")
-    logistics_coordinator_agent = create_logistics_coordinator_agent(location)
-
-    print("[5/5] Creating Marketing Specialist Agent...")
-    marketing_specialist_agent = create_marketing_specialist_agent(conference_topic)
-
-    print("\n✅ All agents created successfully!")
-    print()
-
-    # Create tasks
-    print("Creating tasks for the crew...")
-    strategy_task = create_strategy_task(strategist_agent, conference_topic, target_audience)
-    speaker_task = create_speaker_task(speaker_curator_agent, conference_topic, conference_type)
-    agenda_task = create_agenda_task(agenda_architect_agent, conference_topic, duration, conference_dates)
-    logistics_task = create_logistics_task(logistics_coordinator_agent, location, expected_attendees, conference_dates)
-    marketing_task = create_marketing_task(marketing_specialist_agent, conference_topic, target_audience, conference_dates)
+    try:
+        tasks_output, usage = asyncio.run(plan_conference(inputs, batch=batch))
 
-    print("Tasks created successfully!")
-    print()
+        log.info("\n%s\n✅ Crew Execution Completed Successfully!\n%s\n", "=" * 80, "=" * 80)
+        if usage["prompt_tokens"]:
+            log.info("Prompt cache: %d/%d prompt tokens cached (%.0f%% hit rate)\n",
+                     usage["cached_prompt_tokens"], usage["prompt_tokens"],
+                     100 * usage["cached_prompt_tokens"] / usage["prompt_tokens"])
+        plan = _format_plan(tasks_output)
 
-    # Create the crew with sequential task execution
-    print("Forming the Conference Planning Crew...")
-    print("Task Sequence: Strategist → Speaker Curator → Agenda Architect → Logistics → Marketing")
-    print()
+        log.info("FINAL CONFERENCE PLAN FOR: %s\n%s\n%s\n%s",
+                 conference_topic.upper(), "-" * 80, plan, "-" * 80)
 
-    crew = Crew(
-        agents=[strategist_agent, speaker_curator_agent, agenda_architect_agent, 
-                logistics_coordinator_agent, marketing_specialist_agent],
-        tasks=[strategy_task, speaker_task, agenda_task, logistics_task, marketing_task],
-        verbose=True,
-        process="sequential"
-    )
+        # Save output to file: the report is rendered in full, then written in one call
+        output_path = _output_path(inputs)
+        output_path.write_text(_format_report(inputs, plan), encoding="utf-8")
+        _checkpoint_path(inputs).unlink(missing_ok=True)
 
-    # Execute the crew
-    print("=" * 80)
-    print("Starting Crew Execution...")
-    print(f"Planning {duration} conference: {conference_topic}")
-    print("=" * 80)
-    print()
-
-    try:
-        result = crew.kickoff(inputs={
-            "conference_topic": conference_topic,
-            "conference_type": conference_type,
-            "target_audience": target_audience,
-            "location": location,
-            "conference_dates": conference_dates,
-            "duration": duration,
-            "expected_attendees": expected_attendees
-        })
-
-        print()
-        print("=" * 80)
-        print("✅ Crew Execution Completed Successfully!")
-        print("=" * 80)
-        print()
-        print(f"FINAL CONFERENCE PLAN FOR: {conference_topic.upper()}")
-        print("-" * 80)
-        print(result)
-        print("-" * 80)
-
-        # Save output to file
-        output_filename = f"conference_plan_{conference_topic.lower().replace(' ', '_')}.txt"
-        output_path = Path(__file__).parent / output_filename
-
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write("=" * 80 + "\n")
-            f.write("CrewAI Multi-Agent Conference Planning System - Final Report\n")
-            f.write(f"Planning a {duration} Conference: {conference_topic}\n")
-            f.write("=" * 80 + "\n\n")
-            f.write(f"Conference Details:\n")
-            f.write(f"  Topic: {conference_topic}\n")
-            f.write(f"  Type: {conference_type}\n")
-            f.write(f"  Target Audience: {target_audience}\n")
-            f.write(f"  Location: {location}\n")
-            f.write(f"  Dates: {conference_dates}\n")
-            f.write(f"  Expected Attendees: {expected_attendees}\n\n")
-            f.write(f"Execution Time: {datetime.now()}\n")
-            f.write(f"Model: {Config.OPENAI_MODEL}\n\n")
-            f.write("FINAL CONFERENCE PLAN:\n")
-            f.write("-" * 80 + "\n")
-            f.write(str(result))
-            f.write("\n" + "-" * 80 + "\n")
-
-        print(f"\n✅ Output saved to {output_filename}")
+        log.info("\n✅ Output saved to %s", output_path.name)
 
     except Exception as e:
-        print(f"\n❌ Error during crew execution: {str(e)}")
-        print("\n🔍 Troubleshooting:")
-        print("   1. Verify OPENAI_API_KEY is set in .env file")
-        print("   2. Check API key is valid and has sufficient credits")
-        print("   3. Verify internet connection")
-        print("   4. Check OpenAI API status at https://status.openai.com")
-        print()
-        import traceback
-        traceback.print_exc()
+        log.exception(
+            "\n❌ Error during crew execution: %s\n\n🔍 Troubleshooting:\n"
+            "   1. Verify OPENAI_API_KEY is set in .env file\n"
+            "   2. Check API key is valid and has sufficient credits\n"
+            "   3. Verify internet connection\n"
+            "   4. Check OpenAI API status at https://status.openai.com\n",
+            e,
+        )
 
 
 if __name__ == "__main__":
     import sys
 
     # Default parameters
-    kwargs = {
-        "conference_topic": "Artificial Intelligence in Healthcare",
-        "conference_type": "professional development",
-        "target_audience": "healthcare professionals and AI researchers",
-        "location": "San Francisco, CA",
-        "conference_dates": "March 15-17, 2026",
-        "duration": "3-day",
-        "expected_attendees": 300
-    }
+    kwargs = dict(DEFAULT_CONFERENCE)
 
     # Parse command line arguments (optional)
-    # Usage: python conference_planner.py [topic] [location] [dates]
-    if len(sys.argv) > 1:
-        kwargs["conference_topic"] = sys.argv[1]
-    if len(sys.argv) > 2:
-        kwargs["location"] = sys.argv[2]
-    if len(sys.argv) > 3:
-        kwargs["conference_dates"] = sys.argv[3]
-    if len(sys.argv) > 4:
-        kwargs["target_audience"] = sys.argv[4]
+    # Usage: python conference_planner.py [--batch] [topic] [location] [dates] [audience]
+    args = [arg for arg in sys.argv[1:] if arg != "--batch"]
+    kwargs["batch"] = len(args) != len(sys.argv) - 1
+    if len(args) > 0:
+        kwargs["conference_topic"] = args[0]
+    if len(args) > 1:
+        kwargs["location"] = args[1]
+    if len(args) > 2:
+        kwargs["conference_dates"] = args[2]
+    if len(args) > 3:
+        kwargs["target_audience"] = args[3]
 
     main(**kwargs)
 
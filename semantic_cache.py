@@ -0,0 +1,259 @@
+"""
+Semantic Response Cache for AutoGen and CrewAI Lab Demo
+
+This module provides a small persistent cache for LLM responses so that repeated
+runs with the same (or nearly the same) prompts skip the API call entirely.
+
+Lookups happen in two steps:
+1. Exact match on a SHA-256 key of the prompt (and model / settings)
+2. Semantic match: the nearest stored prompt by embedding cosine similarity,
+   accepted only above a similarity threshold. Only entries in the same scope
+   are compared, where the scope is a key of everything that is not embedded
+   (model, request settings, system prompt), so a near-identical prompt sent
+   to a different model or with different settings is never a hit.
+
+Entries are stored in SQLite. Embeddings come from a caller-supplied function or,
+by default, a local sentence-transformers model (all-MiniLM-L6-v2). FAISS is used
+for the nearest-neighbour search when installed; otherwise a plain Python scan
+is used. Without an embedding model, or when embedding fails, the cache still
+serves exact matches.
+
+Usage:
+    from semantic_cache import SemanticCache
+
+    cache = SemanticCache("llm_cache.sqlite", threshold=0.97)
+    key = SemanticCache.make_key(system_prompt, user_message, model)
+    scope = SemanticCache.make_key(system_prompt, model)
+
+    response = cache.get(key, user_message, scope)
+    if response is None:
+        response = call_llm(...)
+        cache.put(key, user_message, response, scope)
+"""
+
+import hashlib
+import math
+import sqlite3
+import threading
+from array import array
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, List, Optional
+
+DEFAULT_EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+# Recent embeddings kept per cache, so entries sharing a text embed it once
+_EMBEDDING_MEMO_SIZE = 64
+
+# Loaded models are kept per process; loading one takes seconds
+_local_models = {}
+
+
+def local_embedder(model_name: str = DEFAULT_EMBEDDING_MODEL) -> Optional[Callable[[str], List[float]]]:
+    """
+    Get an embedding function backed by a local sentence-transformers model.
+
+    Returns:
+        Callable or None: Function mapping text to an embedding, or None if
+        sentence-transformers is not installed
+    """
+    try:
+        from sentence_transformers import SentenceTransformer
+    except ImportError:
+        return None
+
+    def embed(text: str) -> List[float]:
+        if model_name not in _local_models:
+            _local_models[model_name] = SentenceTransformer(model_name)
+        return _local_models[model_name].encode(text).tolist()
+
+    return embed
+
+
+@lru_cache(maxsize=None)
+def _faiss_modules():
+    """
+    Import FAISS and NumPy on first use, so importing this module stays cheap.
+
+    Returns:
+        tuple: (faiss, numpy), or (None, None) if FAISS is not installed
+    """
+    try:
+        import faiss
+        import numpy as np
+    except ImportError:
+        return None, None
+    return faiss, np
+
+
+def _normalize(vector: List[float]) -> List[float]:
+    """Scale a vector to unit length so inner product equals cosine similarity"""
+    norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+    return [x / norm for x in vector]
+
+
+class _VectorIndex:
+    """Nearest-neighbour index over the normalized embeddings of one scope"""
+
+    def __init__(self):
+        self.keys = []
+        self._vectors = []
+        self._index = None
+        self._faiss, self._np = _faiss_modules()
+
+    def add(self, key: str, vector: List[float]):
+        """Add a normalized embedding"""
+        if self._faiss is not None:
+            if self._index is None:
+                self._index = self._faiss.IndexFlatIP(len(vector))
+            self._index.add(self._np.asarray([vector], dtype="float32"))
+        else:
+            self._vectors.append(vector)
+        self.keys.append(key)
+
+    def nearest(self, vector: List[float]):
+        """Find the stored key most similar to a normalized embedding"""
+        if not self.keys:
+            return None, 0.0
+        if self._faiss is not None:
+            scores, ids = self._index.search(self._np.asarray([vector], dtype="float32"), 1)
+            return self.keys[ids[0][0]], float(scores[0][0])
+        scores = [sum(a * b for a, b in zip(vector, stored)) for stored in self._vectors]
+        best = max(range(len(scores)), key=scores.__getitem__)
+        return self.keys[best], scores[best]
+
+
+class SemanticCache:
+    """
+    Persistent exact + semantic cache of LLM responses.
+
+    Safe to share between threads (e.g. asyncio.to_thread callers).
+    """
+
+    def __init__(self, path, threshold: float = 0.97,
+                 embed: Optional[Callable[[str], List[float]]] = None):
+        """
+        Open (or create) a cache file.
+
+        Args:
+            path: SQLite file to store entries in
+            threshold: Minimum cosine similarity for a semantic hit
+            embed: Function mapping text to an embedding; defaults to the
+                local sentence-transformers model when installed
+        """
+        self.path = Path(path)
+        self.threshold = threshold
+        self.embed = embed or local_embedder()
+        self._lock = threading.Lock()
+        self._embedding = lru_cache(maxsize=_EMBEDDING_MEMO_SIZE)(self._embed_text)
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, scope TEXT NOT NULL DEFAULT '', text TEXT, embedding BLOB, value TEXT)"
+        )
+        # Cache files written before entries were scoped get every old entry in the empty scope
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(entries)")}
+        if "scope" not in columns:
+            self._db.execute("ALTER TABLE entries ADD COLUMN scope TEXT NOT NULL DEFAULT ''")
+        self._db.commit()
+
+        # In-memory vector index over the stored embeddings, one per scope
+        self._indexes = {}
+        for key, scope, blob in self._db.execute(
+                "SELECT key, scope, embedding FROM entries WHERE embedding IS NOT NULL"):
+            self._indexes.setdefault(scope, _VectorIndex()).add(key, array("f", blob).tolist())
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        """Build an exact-match key from the prompt parts (prompts, model, settings)"""
+        return hashlib.sha256("\x1f".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+
+    def _embed_text(self, text: str) -> Optional[List[float]]:
+        """
+        Embed text for the semantic index (memoized per cache as _embedding()).
+
+        Runs outside the cache lock: the embedder may be a slow network call.
+
+        Returns:
+            list or None: Normalized embedding, or None without an embedding
+            model or if embedding failed (e.g. the model cannot be downloaded);
+            the cache then only serves exact matches
+        """
+        if self.embed is None:
+            return None
+        try:
+            return _normalize(self.embed(text))
+        except Exception:
+            return None
+
+    def get(self, key: str, text: Optional[str] = None, scope: str = "") -> Optional[str]:
+        """
+        Look up a cached response.
+
+        Args:
+            key: Exact-match key from make_key()
+            text: Prompt text to embed for the semantic lookup (skipped if None)
+            scope: Key of the request parts not in the text; the semantic
+                lookup only considers entries stored with the same scope
+
+        Returns:
+            str or None: Cached response, or None on a miss
+        """
+        with self._lock:
+            row = self._db.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                return row[0]
+            if text is None or scope not in self._indexes:
+                return None
+        vector = self._embedding(text)
+        if vector is None:
+            return None
+
+        with self._lock:
+            nearest, score = self._indexes[scope].nearest(vector)
+            if nearest is None or score < self.threshold:
+                return None
+            row = self._db.execute("SELECT value FROM entries WHERE key = ?", (nearest,)).fetchone()
+            return row[0] if row else None
+
+    def put(self, key: str, text: str, value: str, scope: str = ""):
+        """
+        Store a response.
+
+        Args:
+            key: Exact-match key from make_key()
+            text: Prompt text (embedded for later semantic lookups; if embedding
+                fails the entry is stored for exact matches only)
+            value: Response to cache
+            scope: Key of the request parts not in the text (see get())
+        """
+        with self._lock:
+            if self._update(key, value):
+                return
+        # Without an embedding the entry is still stored, so exact matches keep working
+        vector = self._embedding(text)
+        blob = array("f", vector).tobytes() if vector is not None else None
+
+        with self._lock:
+            if self._update(key, value):  # Stored by another thread while embedding
+                return
+            self._db.execute(
+                "INSERT INTO entries (key, scope, text, embedding, value) VALUES (?, ?, ?, ?, ?)",
+                (key, scope, text, blob, value),
+            )
+            self._db.commit()
+            if vector is not None:
+                self._indexes.setdefault(scope, _VectorIndex()).add(key, vector)
+
+    def _update(self, key: str, value: str) -> bool:
+        """Replace the value of an existing entry (caller holds the lock); False if there is none"""
+        if self._db.execute("SELECT 1 FROM entries WHERE key = ?", (key,)).fetchone() is None:
+            return False
+        self._db.execute("UPDATE entries SET value = ? WHERE key = ?", (value, key))
+        self._db.commit()
+        return True
+
+    def close(self):
+        """Close the underlying database"""
+        with self._lock:
+            self._db.close()
@@ -16,12 +16,33 @@ Usage:
     config_list = Config.get_config_list()  # For AutoGen
 """
 
+import json
 import os
 from pathlib import Path
 from typing import Dict, List, Any
 from dotenv import load_dotenv
 
 
+def _load_fallback_endpoints(raw: str) -> List[Dict[str, str]]:
+    """
+    Parse LLM_FALLBACKS: a JSON list of {"model", "api_base", "api_key"} objects.
+
+    Returns:
+        List[Dict[str, str]]: Fallback endpoints (empty if unset or invalid)
+    """
+    if not raw:
+        return []
+    try:
+        endpoints = json.loads(raw)
+    except json.JSONDecodeError:
+        print("⚠️  WARNING: LLM_FALLBACKS is not valid JSON, ignoring it")
+        return []
+    return [
+        endpoint for endpoint in endpoints
+        if isinstance(endpoint, dict) and endpoint.get("model") and endpoint.get("api_base")
+    ]
+
+
 class Config:
     """
     Unified configuration class for both AutoGen and CrewAI
@@ -57,12 +78,18 @@ class Config:
     OPENAI_API_BASE = API_BASE
     OPENAI_MODEL = os.getenv("OPENAI_MODEL") or os.getenv("GROQ_MODEL") or DEFAULT_MODEL
 
+    # Further OpenAI-compatible endpoints to fail over to, in order
+    FALLBACK_ENDPOINTS = _load_fallback_endpoints(os.getenv("LLM_FALLBACKS", ""))
+
     # ====================
     # Agent Settings
     # ====================
     AGENT_TEMPERATURE = float(os.getenv("AGENT_TEMPERATURE", "0.7"))
     AGENT_MAX_TOKENS = int(os.getenv("AGENT_MAX_TOKENS", "2000"))
     AGENT_TIMEOUT = int(os.getenv("AGENT_TIMEOUT", "300"))
+    MAX_CONCURRENCY = int(os.getenv("MAX_CONCURRENCY", "3"))  # Parallel API calls in flight
+    MAX_RPM = int(os.getenv("MAX_RPM", "0")) or None  # Requests per minute cap (None = no cap)
+    PLAN_CACHE_ENABLED = os.getenv("PLAN_CACHE_ENABLED", "False").lower() == "true"  # Reuse task outputs of similar plans
 
     # ====================
     # Logging Settings
@@ -112,6 +139,36 @@ class Config:
 
         return True
 
+    @classmethod
+    def check_api_access(cls, timeout: float = 5) -> bool:
+        """
+        Check that the API accepts the key, with one cheap GET /models request.
+
+        Run before building agents, so a bad key or unreachable endpoint fails
+        fast instead of on the first LLM call.
+
+        Returns:
+            bool: True if the endpoint answered 200, False otherwise
+        """
+        import httpx
+
+        try:
+            response = httpx.get(
+                f"{cls.API_BASE.rstrip('/')}/models",
+                headers={"Authorization": f"Bearer {cls.API_KEY}"},
+                timeout=timeout,
+            )
+        except httpx.HTTPError as e:
+            print(f"❌ ERROR: Could not reach {cls.API_BASE}: {e}")
+            return False
+
+        if response.status_code != 200:
+            print(f"❌ ERROR: {cls.API_BASE} rejected the API key (HTTP {response.status_code})")
+            if response.status_code in (401, 403):
+                print("   Check the API key in your .env file")
+            return False
+        return True
+
     @classmethod
     def get_config_list(cls) -> List[Dict[str, Any]]:
         """
@@ -128,16 +185,19 @@ class Config:
                 llm_config={"config_list": config_list}
             )
         """
+        endpoints = [{"model": cls.OPENAI_MODEL, "api_key": cls.API_KEY, "api_base": cls.API_BASE}]
+        endpoints.extend(cls.FALLBACK_ENDPOINTS)  # AutoGen tries the entries in order
         return [
             {
-                "model": cls.OPENAI_MODEL,
-                "api_key": cls.API_KEY,
-                "api_base": cls.API_BASE,
+                "model": endpoint["model"],
+                "api_key": endpoint.get("api_key", ""),
+                "api_base": endpoint["api_base"],
                 "api_type": "openai",  # Groq uses OpenAI-compatible API
                 "temperature": cls.AGENT_TEMPERATURE,
                 "max_tokens": cls.AGENT_MAX_TOKENS,
                 "timeout": cls.AGENT_TIMEOUT,
             }
+            for endpoint in endpoints
         ]
 
     @classmethod
@@ -156,6 +216,10 @@ class Config:
             "agent_temperature": cls.AGENT_TEMPERATURE,
             "agent_max_tokens": cls.AGENT_MAX_TOKENS,
             "agent_timeout": cls.AGENT_TIMEOUT,
+            "max_concurrency": cls.MAX_CONCURRENCY,
+            "max_rpm": cls.MAX_RPM,
+            "plan_cache_enabled": cls.PLAN_CACHE_ENABLED,
+            "fallback_models": [endpoint["model"] for endpoint in cls.FALLBACK_ENDPOINTS],
             "verbose": cls.VERBOSE,
             "debug": cls.DEBUG,
         }
@@ -181,6 +245,10 @@ class Config:
         print(f"✓ Temperature:       {cls.AGENT_TEMPERATURE}")
         print(f"✓ Max Tokens:        {cls.AGENT_MAX_TOKENS}")
         print(f"✓ Timeout:           {cls.AGENT_TIMEOUT}s")
+        print(f"✓ Max Concurrency:   {cls.MAX_CONCURRENCY}")
+        print(f"✓ Max RPM:           {cls.MAX_RPM or 'unlimited'}")
+        print(f"✓ Plan Cache:        {cls.PLAN_CACHE_ENABLED}")
+        print(f"✓ Fallbacks:         {', '.join(e['model'] for e in cls.FALLBACK_ENDPOINTS) or 'none'}")
         print(f"✓ Verbose:           {cls.VERBOSE}")
         print(f"✓ Debug:             {cls.DEBUG}")
         print("="*60 + "\n")
@@ -188,8 +256,8 @@ class Config:
 
 # Convenience functions for quick access
 def validate_config() -> bool:
-    """Quick function to validate configuration."""
-    return Config.validate()
+    """Quick function to validate configuration, including that the API key is accepted."""
+    return Config.validate() and Config.check_api_access()
 
 
 def get_openai_config() -> Dict[str, Any]:
@@ -0,0 +1,113 @@
+"""
+Tests for the semantic response cache (semantic_cache.py).
+
+Run from the project root:
+    python -m unittest discover -s tests
+"""
+
+import sqlite3
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from semantic_cache import SemanticCache
+
+
+def fixed_embedder(vector):
+    """Embedding function mapping every text to the same vector"""
+    return lambda text: list(vector)
+
+
+def failing_embedder(text):
+    raise RuntimeError("embedding model unavailable")
+
+
+class SemanticCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.path = Path(self._dir.name) / "cache.sqlite"
+
+    def tearDown(self):
+        self._dir.cleanup()
+
+    def open(self, embed=None, threshold=0.97):
+        cache = SemanticCache(self.path, threshold=threshold, embed=embed or fixed_embedder([1.0, 0.0]))
+        self.addCleanup(cache.close)
+        return cache
+
+    def test_exact_match(self):
+        cache = self.open()
+        cache.put("key", "prompt", "response")
+        self.assertEqual(cache.get("key"), "response")
+
+    def test_put_overwrites_existing_key(self):
+        cache = self.open()
+        cache.put("key", "prompt", "old")
+        cache.put("key", "prompt", "new")
+        self.assertEqual(cache.get("key"), "new")
+
+    def test_semantic_match_within_scope(self):
+        cache = self.open()
+        cache.put("key", "prompt", "response", scope="gpt-4o")
+        self.assertEqual(cache.get("other-key", "similar prompt", scope="gpt-4o"), "response")
+
+    def test_no_semantic_match_across_scopes(self):
+        cache = self.open()
+        cache.put("key", "prompt", "response", scope="gpt-4o")
+        self.assertIsNone(cache.get("other-key", "similar prompt", scope="gpt-4o-mini"))
+
+    def test_semantic_match_below_threshold(self):
+        vectors = iter([[1.0, 0.0], [0.0, 1.0]])
+        cache = self.open(embed=lambda text: next(vectors))
+        cache.put("key", "prompt", "response")
+        self.assertIsNone(cache.get("other-key", "unrelated prompt"))
+
+    def test_semantic_lookup_needs_text(self):
+        cache = self.open()
+        cache.put("key", "prompt", "response")
+        self.assertIsNone(cache.get("other-key"))
+
+    def test_index_is_rebuilt_on_reopen(self):
+        cache = self.open()
+        cache.put("key", "prompt", "response", scope="scope")
+        cache.close()
+        reopened = self.open()
+        self.assertEqual(reopened.get("other-key", "similar prompt", scope="scope"), "response")
+
+    def test_failing_embedder_stores_for_exact_matches(self):
+        cache = self.open(embed=failing_embedder)
+        cache.put("key", "prompt", "response")
+        self.assertEqual(cache.get("key"), "response")
+
+    def test_failing_embedder_lookup_is_a_miss(self):
+        cache = self.open(embed=failing_embedder)
+        cache.put("key", "prompt", "response")
+        self.assertIsNone(cache.get("other-key", "similar prompt"))
+
+    def test_text_is_embedded_once(self):
+        calls = []
+        cache = self.open(embed=lambda text: calls.append(text) or [1.0, 0.0])
+        cache.put("key-1", "prompt", "response", scope="a")
+        cache.put("key-2", "prompt", "response", scope="b")
+        cache.get("key-3", "prompt", scope="a")
+        self.assertEqual(calls, ["prompt"])
+
+    def test_migrates_unscoped_cache_file(self):
+        db = sqlite3.connect(str(self.path))
+        db.execute("CREATE TABLE entries (key TEXT PRIMARY KEY, text TEXT, embedding BLOB, value TEXT)")
+        db.execute("INSERT INTO entries VALUES ('key', 'prompt', NULL, 'response')")
+        db.commit()
+        db.close()
+
+        cache = self.open()
+        self.assertEqual(cache.get("key"), "response")
+        cache.put("new-key", "prompt", "new response", scope="scope")
+        self.assertEqual(cache.get("other-key", "similar prompt", scope="scope"), "new response")
+
+
+if __name__ == "__main__":
+    unittest.main()